@@ -4,13 +4,28 @@ Introvert Social RPG - Main Game Engine
 A text-based RPG simulating social interactions for introverts
 """
 
+import asyncio
+import atexit
+import hashlib
+import pickle
 import random
-import json
+import re
+import shelve
+import threading
+import time
+from collections import deque
+import orjson
+from array import array
 from dataclasses import dataclass, field, asdict
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, TYPE_CHECKING
 from enum import Enum
-import anthropic
 import os
+import sys
+
+if TYPE_CHECKING:
+    # Only for the client annotations; at runtime anthropic is imported
+    # lazily inside the client factories (see _get_client)
+    import anthropic
 
 # Import NPC type system
 from npc_types import (
@@ -40,11 +55,196 @@ class ExchangeOutcome(Enum):
     NEGATIVE = "negative"
     FAILED = "failed"
 
+# Bond-tier lookup tables indexed by min(int(bond), 4)
+# Tier boundaries match the old <1.0 / <2.0 / <3.0 / <4.0 ladders
+_BOND_TIER = (1, 2, 2, 3, 4)       # Base failure tolerance per bond tier
+_RESTORE_MULT = (2, 3, 4, 5, 6)    # Flirt restoration per consecutive positive
+
+# Canonical stat order for array-shaped stat data (domain bonuses etc.)
+_STAT_ORDER = ('eloquence', 'emotional_intelligence', 'body_language_perception',
+               'persuasion', 'acting', 'intuition')
+_STAT_INDEX = {name: i for i, name in enumerate(_STAT_ORDER)}
+
+# Per-outcome (low, high) ranges for gradual NPC state drift, built once.
+# Keyed by enum member so the handler is a single dict probe instead of an
+# equality ladder. (The enums keep string values - they round-trip through
+# prompts and the dialogue-choice JSON - so tuples indexed by ordinal are out.)
+_RECEPTIVENESS_DRIFT = {
+    ExchangeOutcome.VERY_POSITIVE: (0.75, 1.0),
+    ExchangeOutcome.POSITIVE: (0.25, 0.5),
+    ExchangeOutcome.NEUTRAL: (-0.25, 0.0),
+    ExchangeOutcome.NEGATIVE: (0.0, 0.0),
+    ExchangeOutcome.FAILED: (-0.5, -1.0),
+}
+
+_BOND_DRIFT = {
+    ExchangeOutcome.VERY_POSITIVE: (0.75, 1.0),
+    ExchangeOutcome.POSITIVE: (0.25, 0.5),
+    ExchangeOutcome.NEUTRAL: (-0.25, 0.0),
+    ExchangeOutcome.NEGATIVE: (0.0, 0.0),
+    ExchangeOutcome.FAILED: (-0.25, -0.5),
+}
+
+# Battery / bandwidth deltas per (attraction, outcome), as (low, high)
+# randint bounds. Built once at import; _apply_outcome reduces to two dict
+# probes and two draws instead of three stacked attraction branches each
+# rebuilding a five-entry dict.
+_BATTERY_BOUNDS = {
+    AttractionLevel.ROMANTIC: {
+        ExchangeOutcome.VERY_POSITIVE: (2, 3),
+        ExchangeOutcome.POSITIVE: (1, 2),
+        ExchangeOutcome.NEUTRAL: (-4, -3),
+        ExchangeOutcome.NEGATIVE: (-10, -8),
+        ExchangeOutcome.FAILED: (-24, -22),  # Base + failed penalty
+    },
+    AttractionLevel.PLATONIC: {
+        ExchangeOutcome.VERY_POSITIVE: (1, 1),
+        ExchangeOutcome.POSITIVE: (-1, -1),
+        ExchangeOutcome.NEUTRAL: (-5, -4),
+        ExchangeOutcome.NEGATIVE: (-9, -7),
+        ExchangeOutcome.FAILED: (-20, -18),
+    },
+    AttractionLevel.NEUTRAL: {
+        ExchangeOutcome.VERY_POSITIVE: (0, 0),
+        ExchangeOutcome.POSITIVE: (-2, -2),
+        ExchangeOutcome.NEUTRAL: (-6, -5),
+        ExchangeOutcome.NEGATIVE: (-8, -6),
+        ExchangeOutcome.FAILED: (-21, -19),
+    },
+}
+
+_BANDWIDTH_BOUNDS = {
+    AttractionLevel.ROMANTIC: {
+        ExchangeOutcome.VERY_POSITIVE: (3, 5),
+        ExchangeOutcome.POSITIVE: (1, 2),
+        ExchangeOutcome.NEUTRAL: (-5, -4),
+        ExchangeOutcome.NEGATIVE: (-10, -8),
+        ExchangeOutcome.FAILED: (-26, -18),  # 18 base + 3 failed + 5 sting
+    },
+    AttractionLevel.PLATONIC: {
+        ExchangeOutcome.VERY_POSITIVE: (1, 2),
+        ExchangeOutcome.POSITIVE: (0, 0),
+        ExchangeOutcome.NEUTRAL: (-7, -6),
+        ExchangeOutcome.NEGATIVE: (-9, -7),
+        ExchangeOutcome.FAILED: (-16, -13),
+    },
+    AttractionLevel.NEUTRAL: {
+        ExchangeOutcome.VERY_POSITIVE: (0, 0),
+        ExchangeOutcome.POSITIVE: (-2, -2),
+        ExchangeOutcome.NEUTRAL: (-8, -7),
+        ExchangeOutcome.NEGATIVE: (-8, -6),
+        ExchangeOutcome.FAILED: (-15, -12),
+    },
+}
+
+# Pre-drawn pool of domain bonus values (1-3). Refilled in blocks so the
+# hot get_domain_bonus loop pays one list index per draw instead of a full
+# Mersenne Twister call.
+_BONUS_POOL: List[int] = []
+_BONUS_IDX = 0
+
+def _next_bonus() -> int:
+    """Pop the next pre-drawn domain bonus (uniform 1-3)"""
+    global _BONUS_POOL, _BONUS_IDX
+    if _BONUS_IDX >= len(_BONUS_POOL):
+        _BONUS_POOL = random.choices((1, 2, 3), k=4096)
+        _BONUS_IDX = 0
+    value = _BONUS_POOL[_BONUS_IDX]
+    _BONUS_IDX += 1
+    return value
+
+# Canned early-conversation responses keyed by (attraction, success).
+# While the NPC is still near default state (no bond, neutral
+# receptiveness) there is little context for the model to use, so a
+# templated line stands in for the LLM round-trip. {name} is the NPC.
+_TEMPLATED_RESPONSES = {
+    (AttractionLevel.NEUTRAL, True): (
+        "Sure, that works.",
+        "Oh - yeah, no problem.",
+        "Mm-hm. Anything else?",
+        "Okay, sure.",
+        "Yeah, that's fine.",
+    ),
+    (AttractionLevel.NEUTRAL, False): (
+        "Sorry, what?",
+        "Uh... I'm not sure what you mean.",
+        "Right. Anyway.",
+        "Hm. Okay then.",
+        "I should probably get back to what I was doing.",
+    ),
+    (AttractionLevel.PLATONIC, True): (
+        "Ha, yeah! I was just thinking that.",
+        "Oh nice, same here actually.",
+        "Yeah? That's pretty cool.",
+        "Haha, fair enough.",
+        "Oh totally. It's been one of those days.",
+    ),
+    (AttractionLevel.PLATONIC, False): (
+        "Oh. Um, sure, I guess?",
+        "Heh... not really my thing, honestly.",
+        "Hm? Sorry, I spaced out for a second.",
+        "That's... an interesting way to put it.",
+        "Anyway - what were you saying before?",
+    ),
+    (AttractionLevel.ROMANTIC, True): (
+        "Oh! Hi. I mean - hey.",
+        "Haha, okay, that was smooth.",
+        "You're kind of funny, you know that?",
+        "I was hoping someone would say something.",
+        "Well, now you have my attention.",
+    ),
+    (AttractionLevel.ROMANTIC, False): (
+        "Oh. Um. Thanks?",
+        "Ha... okay.",
+        "That's sweet, but I'm kind of in the middle of something.",
+        "I don't really know what to say to that.",
+        "Wow. Okay.",
+    ),
+}
+
+# The type system precombines every (role, archetype, context) triple at
+# import, so the merge is a dict probe there. The merge-on-the-fly path
+# only remains for partially-typed NPCs.
+def _combined_mods(role: Optional[NPCRole],
+                   archetype: Optional[PersonalityArchetype],
+                   social_context: Optional[SocialContext]) -> NPCTypeModifiers:
+    """Merged type modifiers for one (role, archetype, context) combination"""
+    # The precombined table covers the UNKNOWN sentinels too, so a
+    # partially-typed NPC is still a single dict probe
+    return NPCTypeSystem.get_combined(
+        role if role is not None else NPCRole.UNKNOWN,
+        archetype if archetype is not None else PersonalityArchetype.UNKNOWN,
+        social_context if social_context is not None else SocialContext.UNKNOWN)
+
+# Successful-exchange outcome grading per (risk level, bond >= 4.0):
+# (outcome above threshold, outcome at/below threshold, threshold).
+# One uniform draw against the threshold replaces the branch ladder.
+_OUTCOME_TABLE = {
+    (RiskLevel.SAFE, False): (ExchangeOutcome.POSITIVE, ExchangeOutcome.NEUTRAL, 0.3),
+    (RiskLevel.SAFE, True): (ExchangeOutcome.POSITIVE, ExchangeOutcome.NEUTRAL, 0.3),
+    (RiskLevel.MODERATE, False): (ExchangeOutcome.POSITIVE, ExchangeOutcome.POSITIVE, 0.0),
+    (RiskLevel.MODERATE, True): (ExchangeOutcome.POSITIVE, ExchangeOutcome.POSITIVE, 0.0),
+    (RiskLevel.RISKY, False): (ExchangeOutcome.VERY_POSITIVE, ExchangeOutcome.POSITIVE, 0.5),
+    (RiskLevel.RISKY, True): (ExchangeOutcome.VERY_POSITIVE, ExchangeOutcome.POSITIVE, 0.5),
+    (RiskLevel.VERY_RISKY, False): (ExchangeOutcome.VERY_POSITIVE, ExchangeOutcome.POSITIVE, 0.5),
+    # High bond makes very risky plays land outright
+    (RiskLevel.VERY_RISKY, True): (ExchangeOutcome.VERY_POSITIVE, ExchangeOutcome.VERY_POSITIVE, 0.0),
+}
+
+# Max momentum bonus per risk level, built once instead of per call
+# (RiskLevel keeps string values for serialization, so a dict, not a tuple)
+_MOMENTUM_CAPS = {
+    RiskLevel.SAFE: 10,       # 5 positives
+    RiskLevel.MODERATE: 12,   # 6 positives
+    RiskLevel.RISKY: 14,      # 7 positives
+    RiskLevel.VERY_RISKY: 16  # 8 positives
+}
+
 # ============================================================================
 # DATA CLASSES
 # ============================================================================
 
-@dataclass
+@dataclass(slots=True)
 class CharacterStats:
     """Player character statistics"""
     eloquence: int = 0
@@ -62,33 +262,91 @@ class CharacterStats:
     profession: str = ""
     hobbies: List[str] = field(default_factory=list)
     location: str = ""
-    
+
+    # Cached lowercase background for domain checks (refreshed by update_background)
+    _profession_lc: str = field(default="", init=False, repr=False)
+    _hobbies_haystack: str = field(default="", init=False, repr=False)
+
+    # Running total of the six core stats (maintained by adjust_stat)
+    _total: int = field(default=0, init=False, repr=False)
+    # Bumped on every mutation; lets callers cache derived/serialized views
+    _stats_version: int = field(default=0, init=False, repr=False)
+
+    def __post_init__(self):
+        self.update_background()
+        self._total = (self.eloquence + self.emotional_intelligence +
+                      self.body_language_perception + self.persuasion +
+                      self.acting + self.intuition)
+
+    def update_background(self, profession: Optional[str] = None,
+                         hobbies: Optional[List[str]] = None):
+        """Update profession/hobbies and refresh the lowercase caches"""
+        if profession is not None:
+            self.profession = profession
+        if hobbies is not None:
+            self.hobbies = hobbies
+        self._profession_lc = self.profession.lower()
+        # One haystack for all hobbies: a single C-level substring scan
+        # replaces per-hobby membership checks. ' | ' separates entries so a
+        # topic cannot match across hobby boundaries.
+        self._hobbies_haystack = ' | '.join(hobby.lower() for hobby in self.hobbies)
+        self._stats_version += 1
+
+    def stats_vector(self) -> Tuple[int, ...]:
+        """Core stats as a tuple in canonical _STAT_ORDER"""
+        return (self.eloquence, self.emotional_intelligence,
+                self.body_language_perception, self.persuasion,
+                self.acting, self.intuition)
+
+    def adjust_stat(self, name: str, delta: int):
+        """Change a core stat and keep the running total in sync"""
+        setattr(self, name, getattr(self, name) + delta)
+        self._total += delta
+        self._stats_version += 1
+
     def total_points(self) -> int:
-        return (self.eloquence + self.emotional_intelligence + 
-                self.body_language_perception + self.persuasion + 
-                self.acting + self.intuition)
+        return self._total
     
-    def get_domain_bonus(self, topic: str) -> Dict[str, int]:
-        """Returns stat bonuses if topic matches profession/hobbies"""
-        bonuses = {}
-        
-        # Check if topic relates to profession or hobbies
-        is_domain = (topic.lower() in self.profession.lower() or 
-                    any(topic.lower() in hobby.lower() for hobby in self.hobbies))
-        
+    def get_domain_bonus(self, topic: str) -> List[int]:
+        """Returns per-stat bonuses (in _STAT_ORDER) if topic matches profession/hobbies"""
+        bonuses = [0, 0, 0, 0, 0, 0]
+
+        # Check if topic relates to profession or hobbies (cached lowercase)
+        topic_lc = topic.lower()
+        is_domain = (topic_lc in self._profession_lc or
+                    topic_lc in self._hobbies_haystack)
+
         if not is_domain:
             return bonuses
-            
+
         # Apply bonuses to stats <= 1
-        for stat_name in ['eloquence', 'acting', 'persuasion', 'intuition']:
+        for stat_name in ('eloquence', 'acting', 'persuasion', 'intuition'):
             stat_value = getattr(self, stat_name)
             if stat_value <= 1:
-                bonus = random.randint(1, 3)
-                bonuses[stat_name] = bonus
-                
+                bonuses[_STAT_INDEX[stat_name]] = _next_bonus()
+
         return bonuses
 
-@dataclass
+# Specialized flirt-rate closures, one per distinct base rate. The base rate
+# is fixed once attraction is rolled, so it gets baked into straight-line
+# bytecode; only the per-call variables (uses, positives, bond) stay live.
+_FLIRT_FN_CACHE: Dict[int, object] = {}
+
+def _compile_flirt_fn(base: int):
+    """Build (or fetch) a flirt-rate closure specialized to one base rate"""
+    fn = _FLIRT_FN_CACHE.get(base)
+    if fn is None:
+        rate = (f"{base} - u * 20 + c * "
+                "(2 if b < 1.0 else 3 if b < 2.0 else 4 if b < 3.0 else 5 if b < 4.0 else 6)")
+        fn = _FLIRT_FN_CACHE[base] = eval(f"lambda u, c, b: max(10, min(100, {rate}))")
+    return fn
+
+# Shared pool for longer NPC text fields. Recurring archetypes repeat a lot
+# of description text across a populated world; pooling collapses duplicates
+# to one object so equality checks hit the identity fast path.
+_TEXT_POOL: Dict[str, str] = {}
+
+@dataclass(slots=True)
 class NPCState:
     """State of an NPC during interaction"""
     name: str
@@ -100,9 +358,11 @@ class NPCState:
     interests: List[str]
     
     # NPC Type information
-    role: Optional[NPCRole] = None
-    archetype: Optional[PersonalityArchetype] = None
-    social_context: Optional[SocialContext] = None
+    # UNKNOWN sentinels instead of None: .value and table lookups work
+    # without an is-None branch at every print/serialization site
+    role: NPCRole = NPCRole.UNKNOWN
+    archetype: PersonalityArchetype = PersonalityArchetype.UNKNOWN
+    social_context: SocialContext = SocialContext.UNKNOWN
     type_modifiers: Optional[NPCTypeModifiers] = None
     
     # Interaction state
@@ -120,52 +380,150 @@ class NPCState:
     
     # Acting/Disinterest tracking
     disinterest_signals: int = 0  # Tracks accidental disinterest shown
-    
+
+    # Flirt-rate closure specialized to base_flirt_success; reset when re-rolled
+    _flirt_fn: Optional[object] = field(default=None, init=False, repr=False)
+    # Bumped on every mutation; lets callers cache derived/serialized views
+    _stats_version: int = field(default=0, init=False, repr=False)
+
+    def __getstate__(self):
+        # Compiled closures don't pickle; rebuild lazily after load
+        state = {name: getattr(self, name) for name in self.__dataclass_fields__}
+        state['_flirt_fn'] = None
+        return state
+
+    def __setstate__(self, state):
+        for name, value in state.items():
+            setattr(self, name, value)
+
+    def __post_init__(self):
+        # Deduplicate string fields: intern the short ones, pool the long ones
+        self.name = sys.intern(self.name)
+        self.personality = sys.intern(self.personality)
+        self.description = _TEXT_POOL.setdefault(self.description, self.description)
+        self.background = _TEXT_POOL.setdefault(self.background, self.background)
+
     def can_tolerate_failure(self) -> bool:
         """Determines if NPC will continue conversation after failure based on bond"""
-        # Base tolerance by bond level
-        if self.bond < 1.0:
-            base_tolerance = 1
-        elif self.bond < 2.0:
-            base_tolerance = 2
-        elif self.bond < 3.0:
-            base_tolerance = 2
-        elif self.bond < 4.0:
-            base_tolerance = 3
-        else:  # bond >= 4.0
-            base_tolerance = 4
-        
-        # Apply type modifier
+        # Base tolerance by bond tier (table lookup instead of branch ladder)
+        base_tolerance = _BOND_TIER[min(int(self.bond), 4)]
+
+        # Apply type modifier inline; same math as
+        # NPCTypeSystem.adjust_failure_tolerance without the call dispatch
         if self.type_modifiers:
-            base_tolerance = NPCTypeSystem.adjust_failure_tolerance(
-                base_tolerance, self.type_modifiers
+            base_tolerance = max(
+                0, base_tolerance + self.type_modifiers.failure_tolerance_modifier
             )
-        
+
         return self.failures_this_interaction < base_tolerance
     
     def get_flirt_success_rate(self) -> int:
         """Calculate current flirt success rate with degradation"""
-        base = self.base_flirt_success
-        
-        # Degradation per use
-        degradation = self.flirt_uses * 20
-        
-        # Bond-based restoration
-        if self.bond < 1.0:
-            restoration = self.consecutive_positives * 2
-        elif self.bond < 2.0:
-            restoration = self.consecutive_positives * 3
-        elif self.bond < 3.0:
-            restoration = self.consecutive_positives * 4
-        elif self.bond < 4.0:
-            restoration = self.consecutive_positives * 5
-        else:
-            restoration = self.consecutive_positives * 6
-            
-        rate = base - degradation + restoration
-        return max(10, min(100, rate))  # Clamp between 10-100
+        # Straight-line closure with base rate, degradation and bond-tier
+        # restoration baked in; compiled on first use per base rate
+        fn = self._flirt_fn
+        if fn is None:
+            fn = self._flirt_fn = _compile_flirt_fn(self.base_flirt_success)
+        return fn(self.flirt_uses, self.consecutive_positives, self.bond)
+
+# ----------------------------------------------------------------------------
+# Numeric kernels over NPCTable columns. Pure numeric free functions with
+# locals-only loops: no attribute lookups or string logic inside, so they stay
+# tight under CPython and are JIT-ready if a compiler is ever added.
+# ----------------------------------------------------------------------------
+
+def _kernel_flirt_rates(base, uses, positives, bond_x10) -> List[int]:
+    """Flirt success rate per NPC from the SoA columns"""
+    restore = _RESTORE_MULT
+    rates = []
+    append = rates.append
+    for b, u, p, bond in zip(base, uses, positives, bond_x10):
+        rate = b - u * 20 + p * restore[min(bond // 10, 4)]
+        append(10 if rate < 10 else 100 if rate > 100 else rate)
+    return rates
+
+def _kernel_failure_tolerances(bond_x10, tolerance_deltas) -> List[int]:
+    """Base failure tolerance per NPC, adjusted by per-NPC type deltas"""
+    tier = _BOND_TIER
+    return [max(0, tier[min(bond // 10, 4)] + delta)
+            for bond, delta in zip(bond_x10, tolerance_deltas)]
+
+# Accidental-disinterest trigger rates indexed by Acting stat (0-5);
+# out-of-range stats fall back to 0.4.
+_TRIGGER_RATES = (0.6, 0.6, 0.4, 0.2, 0.1, 0.1)
+
+def _disinterest_roll(acting: int, multiplier: float,
+                      rng: random.Random = random) -> bool:
+    """Roll an accidental-disinterest trigger for the given Acting stat"""
+    rate = _TRIGGER_RATES[acting] if 0 <= acting < 6 else 0.4
+    return rng.random() < rate * multiplier
+
+class NPCTable:
+    """Structure-of-arrays roster for bulk NPC updates.
+
+    Numeric interaction state lives in parallel typed arrays so world
+    ticks (e.g. computing flirt rates or failure tolerances for every
+    NPC) scan contiguous memory instead of chasing per-object pointers.
+    Strings stay in parallel lists. NPCState remains the per-interaction
+    object API; sync_from_npc/sync_to_npc move one NPC between the two.
+    """
+
+    def __init__(self):
+        self.names: List[str] = []
+        # bond/receptiveness quantized to tenths (0-100 in an int8 lane);
+        # 0.1 resolution is all the tier math ever reads
+        self.bond_x10 = array('b')
+        self.recept_x10 = array('b')
+        self.consecutive_positives = array('h')
+        self.flirt_uses = array('b')
+        self.base_flirt_success = array('b')
+        self.failures = array('b')
+        self.tolerance_deltas = array('b')
+
+    def __len__(self) -> int:
+        return len(self.names)
 
-@dataclass
+    def append(self, npc: 'NPCState') -> int:
+        """Add an NPC to the roster, returning its row index"""
+        self.names.append(npc.name)
+        self.bond_x10.append(int(npc.bond * 10))
+        self.recept_x10.append(int(npc.receptiveness * 10))
+        self.consecutive_positives.append(npc.consecutive_positives)
+        self.flirt_uses.append(npc.flirt_uses)
+        self.base_flirt_success.append(npc.base_flirt_success)
+        self.failures.append(npc.failures_this_interaction)
+        self.tolerance_deltas.append(
+            npc.type_modifiers.failure_tolerance_modifier if npc.type_modifiers else 0)
+        return len(self.names) - 1
+
+    def sync_from_npc(self, index: int, npc: 'NPCState'):
+        """Write an NPC's interaction state back into its roster row"""
+        self.bond_x10[index] = int(npc.bond * 10)
+        self.recept_x10[index] = int(npc.receptiveness * 10)
+        self.consecutive_positives[index] = npc.consecutive_positives
+        self.flirt_uses[index] = npc.flirt_uses
+        self.base_flirt_success[index] = npc.base_flirt_success
+        self.failures[index] = npc.failures_this_interaction
+
+    def sync_to_npc(self, index: int, npc: 'NPCState'):
+        """Load a roster row's interaction state into an NPC object"""
+        npc.bond = self.bond_x10[index] / 10
+        npc.receptiveness = self.recept_x10[index] / 10
+        npc.consecutive_positives = self.consecutive_positives[index]
+        npc.flirt_uses = self.flirt_uses[index]
+        npc.base_flirt_success = self.base_flirt_success[index]
+        npc.failures_this_interaction = self.failures[index]
+
+    def flirt_rates(self) -> List[int]:
+        """Compute current flirt success rates for every NPC in one pass"""
+        return _kernel_flirt_rates(self.base_flirt_success, self.flirt_uses,
+                                   self.consecutive_positives, self.bond_x10)
+
+    def failure_tolerances(self) -> List[int]:
+        """Compute type-adjusted failure tolerances for every NPC in one pass"""
+        return _kernel_failure_tolerances(self.bond_x10, self.tolerance_deltas)
+
+@dataclass(slots=True)
 class DialogueChoice:
     """A dialogue option presented to the player"""
     text: str
@@ -175,8 +533,22 @@ class DialogueChoice:
     is_flirt: bool = False
     is_disinterest_bridge: bool = False  # Special option to connect topic to domain
     topic: Optional[str] = None
+    # Pre-rolled NPC replies generated in the same call as the choice, so
+    # resolving the choice needs no second LLM round trip
+    success_response: Optional[str] = None
+    failure_response: Optional[str] = None
+
+    # requires_stats packed into _STAT_ORDER positions for positional compares
+    _req_vec: Tuple[int, ...] = field(default=(0, 0, 0, 0, 0, 0), init=False, repr=False)
+
+    def __post_init__(self):
+        if self.requires_stats:
+            req = [0, 0, 0, 0, 0, 0]
+            for name, value in self.requires_stats.items():
+                req[_STAT_INDEX[name]] = value
+            self._req_vec = tuple(req)
 
-@dataclass
+@dataclass(slots=True)
 class InteractionContext:
     """Current context of an interaction"""
     npc: NPCState
@@ -185,30 +557,337 @@ class InteractionContext:
     time_of_day: str
     momentum_bonus: int = 0  # +2% per consecutive positive, capped by risk level
     domain_active: Optional[str] = None
-    
+
     def get_momentum_cap(self, risk: RiskLevel) -> int:
         """Returns max momentum bonus for given risk level"""
-        caps = {
-            RiskLevel.SAFE: 10,      # 5 positives
-            RiskLevel.MODERATE: 12,   # 6 positives
-            RiskLevel.RISKY: 14,      # 7 positives
-            RiskLevel.VERY_RISKY: 16  # 8 positives
-        }
-        return caps[risk]
+        return _MOMENTUM_CAPS[risk]
 
 # ============================================================================
 # GAME ENGINE
 # ============================================================================
 
+# Shared Anthropic clients, one per API key. Reusing a client reuses its
+# underlying httpx connection pool, so turns after the first skip the
+# TLS handshake and DNS lookup. The pool is sized to keep connections
+# warm across the several sequential calls a turn makes.
+# (HTTP/2 would need the httpx h2 extra, which is not a dependency.)
+#
+# anthropic and httpx are imported lazily here: scripts that never talk
+# to the API (save-file tooling, the type-system demos) skip their
+# import cost entirely.
+_HTTP_KEEPALIVE_CONNECTIONS = 10
+_HTTP_MAX_CONNECTIONS = 20
+_HTTP_TIMEOUT = 30.0
+
+_CLIENT_CACHE: Dict[str, "anthropic.Anthropic"] = {}
+
+def _get_client(api_key: str) -> "anthropic.Anthropic":
+    """Return the shared Anthropic client for an API key"""
+    client = _CLIENT_CACHE.get(api_key)
+    if client is None:
+        import anthropic
+        import httpx
+        limits = httpx.Limits(max_keepalive_connections=_HTTP_KEEPALIVE_CONNECTIONS,
+                              max_connections=_HTTP_MAX_CONNECTIONS)
+        client = _CLIENT_CACHE[api_key] = anthropic.Anthropic(
+            api_key=api_key,
+            http_client=httpx.Client(limits=limits, timeout=_HTTP_TIMEOUT))
+    return client
+
+# The async cache is keyed by API key but also remembers the event loop
+# each client was built under: every asyncio.run call creates a fresh
+# loop, and a keepalive connection pooled under a previous (now closed)
+# loop raises "Event loop is closed" when the new loop reuses it. A
+# cache hit from a different loop is discarded and a fresh client built.
+_ASYNC_CLIENT_CACHE: Dict[str, tuple] = {}
+
+def _get_async_client(api_key: str) -> "anthropic.AsyncAnthropic":
+    """Return the async Anthropic client bound to the running event loop.
+
+    Must be called from within a running loop; connection reuse applies
+    per loop, so all calls inside one asyncio.run share a pool.
+    """
+    loop = asyncio.get_running_loop()
+    entry = _ASYNC_CLIENT_CACHE.get(api_key)
+    if entry is not None and entry[0] is loop:
+        return entry[1]
+    import anthropic
+    import httpx
+    limits = httpx.Limits(max_keepalive_connections=_HTTP_KEEPALIVE_CONNECTIONS,
+                          max_connections=_HTTP_MAX_CONNECTIONS)
+    client = anthropic.AsyncAnthropic(
+        api_key=api_key,
+        http_client=httpx.AsyncClient(limits=limits, timeout=_HTTP_TIMEOUT))
+    _ASYNC_CLIENT_CACHE[api_key] = (loop, client)
+    return client
+
+# Cap on concurrent in-flight LLM requests (API rate limits)
+_MAX_CONCURRENT_REQUESTS = 8
+
+# Parse/lookup tables for player input and LLM payload values, built once
+_ATTRACTION_MAP = {
+    'A': AttractionLevel.NEUTRAL,
+    'B': AttractionLevel.PLATONIC,
+    'C': AttractionLevel.ROMANTIC
+}
+
+_RISK_MAP = {
+    'safe': RiskLevel.SAFE,
+    'moderate': RiskLevel.MODERATE,
+    'risky': RiskLevel.RISKY,
+    'very_risky': RiskLevel.VERY_RISKY
+}
+
+# Markdown code fence around an LLM JSON payload, compiled once
+_FENCE_RE = re.compile(r"^\s*```(?:json)?\s*\n?(.*?)\n?\s*```\s*$", re.DOTALL)
+
+def _extract_json(text: str) -> str:
+    """Strip a surrounding markdown code fence from an LLM response, if any"""
+    match = _FENCE_RE.match(text)
+    return (match.group(1) if match else text).strip()
+
+# Static prompt scaffolding, sent as system blocks marked for Anthropic
+# prompt caching: the repeated prefix tokens skip prefill on cache hits,
+# leaving only the short dynamic user message to process at full price.
+
+_SYSTEM_NPC_GEN = """Generate a realistic NPC character for a social interaction RPG \
+based on the location, context and NPC type context the user provides.
+
+Create a character with:
+1. Name (first name only, or just role like "Barista")
+2. Age range (e.g., "early 20s", "mid-30s")
+3. Brief physical description (2-3 sentences, natural details)
+4. Personality traits (2-3 key traits that match the archetype)
+5. Brief background (1-2 sentences)
+6. 2-3 interests/hobbies
+
+Make them feel like a real person you might encounter in this location.
+Keep it concise and natural.
+The personality should reflect the type context provided.
+
+Return ONLY valid JSON in this exact format:
+{
+    "name": "string",
+    "age_range": "string",
+    "appearance": "string",
+    "personality": "string",
+    "background": "string",
+    "interests": ["string", "string"]
+}"""
+
+_SYSTEM_DIALOGUE_GEN = """You are generating dialogue choices for a social interaction RPG. \
+The user provides the current situation, player stats and NPC state.
+
+CRITICAL RULES:
+1. Generate EXACTLY 4 dialogue choices
+2. ONE must be Safe (75-92% base success)
+3. ONE must be Moderate (55-75% base success)
+4. ONE must be Risky (35-55% base success)
+5. ONE must be Very Risky (<35% base success)
+6. RANDOMIZE the order - do not present in order of risk
+7. Each choice should feel natural and distinct
+8. Consider NPC type notes when generating options
+9. For each choice, also write the NPC's reply if it lands (warm, engaged)
+   and if it falls flat (cooler, pulling back) - 1-2 sentences each, in the
+   NPC's voice
+
+RISK FACTORS:
+- Safe: Simple, low-stakes, agreeable
+- Moderate: Mild challenge, personal question, light disagreement
+- Risky: Bold statement, vulnerable admission, challenging their view
+- Very Risky: Very personal too soon, controversial, pushy
+
+Return ONLY valid JSON array with 4 choices:
+[
+    {
+        "text": "exact dialogue text",
+        "risk_level": "safe|moderate|risky|very_risky",
+        "base_success_rate": number (match risk level guidelines),
+        "is_flirt": boolean,
+        "topic": "optional topic string",
+        "success_response": "NPC reply if the line lands",
+        "failure_response": "NPC reply if the line falls flat"
+    }
+]"""
+
+# Bucketed dialogue-choice cache: turns whose NPC lands in the same
+# coarse bucket (type, attraction, whole-point bond and receptiveness)
+# can share one set of generated choices. Choices are reshuffled on
+# each hit so repeats don't read identically.
+_DIALOGUE_CACHE_MAX = 512
+
+def _dialogue_bucket(npc: NPCState) -> tuple:
+    """Coarse cache key for dialogue-choice generation"""
+    return (npc.role, npc.archetype, npc.attraction_level,
+            int(npc.bond), int(npc.receptiveness))
+
+_SYSTEM_NPC_RESPONSE = """You generate the NPC's next line in a social interaction RPG. \
+The user provides what the player said, the outcome, and the NPC's state.
+
+The response should be:
+- Natural and conversational
+- Reflect the NPC's personality
+- Match the success/failure outcome and requested tone
+- 1-3 sentences typically"""
+
+def _system_blocks(text: str) -> List[Dict]:
+    """Wrap a static system prompt in a cache_control block"""
+    return [{"type": "text", "text": text, "cache_control": {"type": "ephemeral"}}]
+
+# On-disk response cache, content-addressed by (model, max_tokens, prompt).
+# Repeat prompts skip the multi-second API round-trip and its token spend.
+_RESPONSE_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                    ".llm_cache")
+_response_cache: Optional[shelve.Shelf] = None
+# shelve does not support concurrent access; the dialogue prefetch
+# worker and the main thread share the shelf, so every open/read/write
+# goes through this lock
+_response_cache_lock = threading.Lock()
+
+def _get_response_cache() -> shelve.Shelf:
+    """Open the shared on-disk response cache lazily"""
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                _response_cache = shelve.open(_RESPONSE_CACHE_PATH)
+                # Flush the dbm backend on interpreter exit
+                atexit.register(_response_cache.close)
+    return _response_cache
+
 class IntrovertRPG:
     """Main game engine"""
-    
-    def __init__(self, api_key: str):
-        self.client = anthropic.Anthropic(api_key=api_key)
+
+    # Model tiers: the fast tier serves latency-sensitive per-turn calls
+    # (dialogue choices, short NPC replies); the smart tier is reserved for
+    # one-off NPC creation where quality matters more than speed.
+    MODEL_FAST = "claude-haiku-4-5"
+    MODEL_SMART = "claude-opus-4-20250514"
+
+    def __init__(self, api_key: str, seed: Optional[int] = None):
+        self._api_key = api_key
+        self.client = _get_client(api_key)
+        # Own RNG: game rolls stay deterministic under a seed and do not
+        # contend with module-level random state once turns overlap in async
+        self._rng = random.Random(seed)
         self.player: Optional[CharacterStats] = None
         self.current_interaction: Optional[InteractionContext] = None
         self.conversation_history: List[Dict] = []
-        
+        self._npc_pools: Dict[str, deque] = {}  # Pre-generated NPCs by location
+        # Serialized player/NPC state for the dialogue prompt, reused while
+        # neither side has mutated (keyed by object ids + version counters)
+        self._state_json_key: Optional[tuple] = None
+        self._state_json_val: Optional[tuple] = None
+        # In-flight speculative dialogue-choice request, if any
+        self._next_choices_task: Optional["asyncio.Task"] = None
+        # Bucketed dialogue-choice cache (see _dialogue_bucket)
+        self._dialogue_cache: Dict[tuple, List[DialogueChoice]] = {}
+
+    @property
+    def async_client(self) -> "anthropic.AsyncAnthropic":
+        """Async client for the running event loop (see _get_async_client)"""
+        return _get_async_client(self._api_key)
+
+    def close(self):
+        """Close the HTTP connection pools and release the shared clients.
+
+        The clients are evicted from the module caches before closing, so
+        a game constructed later with the same API key builds fresh
+        clients instead of being handed these closed ones.
+        """
+        if _CLIENT_CACHE.get(self._api_key) is self.client:
+            del _CLIENT_CACHE[self._api_key]
+        self.client.close()
+        # AsyncAnthropic.close() is a coroutine and must run on the loop
+        # the client was built under; once that loop is gone its pooled
+        # connections are already dead and there is nothing left to close.
+        entry = _ASYNC_CLIENT_CACHE.pop(self._api_key, None)
+        if entry is not None:
+            loop, async_client = entry
+            try:
+                running = asyncio.get_running_loop()
+            except RuntimeError:
+                running = None
+            if loop is running:
+                asyncio.ensure_future(async_client.close())
+            elif not loop.is_closed() and not loop.is_running():
+                loop.run_until_complete(async_client.close())
+
+
+    # ========================================================================
+    # LLM HELPERS
+    # ========================================================================
+
+    def _create_message(self, on_text=None, **kwargs) -> str:
+        """Run one LLM call and return the full response text.
+
+        With an on_text callback the call streams: each text chunk is
+        handed to the callback as it arrives, so display/parsing overlaps
+        the network wait instead of blocking on the full completion.
+        """
+        if on_text is None:
+            response = self.client.messages.create(**kwargs)
+            return response.content[0].text
+
+        chunks = []
+        with self.client.messages.stream(**kwargs) as stream:
+            for text in stream.text_stream:
+                chunks.append(text)
+                on_text(text)
+        return "".join(chunks)
+
+    def _cached_message(self, prompt: str, max_tokens: int,
+                        model: Optional[str] = None,
+                        on_text=None, system: Optional[str] = None,
+                        temperature: Optional[float] = None,
+                        cache_seed: Optional[int] = None) -> str:
+        """LLM call with a content-addressed cache in front.
+
+        The cache key hashes every parameter that shapes the completion
+        (model, max_tokens, temperature, system, prompt), so replays and
+        repeated states resolve from disk in microseconds instead of a
+        network round-trip. On a hit with an on_text callback, the cached
+        text is delivered through the callback in one chunk.
+
+        Calls that explicitly sample (temperature > 0) bypass the cache,
+        since replaying one frozen sample defeats the point of sampling;
+        pass a cache_seed to opt such a call back in, with the seed
+        becoming part of the key.
+        """
+        if model is None:
+            model = self.MODEL_SMART
+
+        cacheable = (temperature is None or temperature == 0.0
+                     or cache_seed is not None)
+        if cacheable:
+            key = hashlib.blake2b(
+                f"{model}|{max_tokens}|{temperature}|{cache_seed}|"
+                f"{system or ''}|{prompt}".encode()
+            ).hexdigest()
+            cache = _get_response_cache()
+            with _response_cache_lock:
+                text = cache.get(key)
+            if text is not None:
+                if on_text is not None:
+                    on_text(text)
+                return text
+
+        kwargs = dict(
+            model=model,
+            max_tokens=max_tokens,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        if system is not None:
+            kwargs['system'] = _system_blocks(system)
+        if temperature is not None:
+            kwargs['temperature'] = temperature
+
+        text = self._create_message(on_text=on_text, **kwargs)
+        if cacheable:
+            with _response_cache_lock:
+                cache[key] = text
+        return text
+
     # ========================================================================
     # CHARACTER CREATION
     # ========================================================================
@@ -238,77 +917,55 @@ class IntrovertRPG:
     # NPC GENERATION
     # ========================================================================
     
-    def generate_npc(self, location: str, context: str = "",
-                    role: Optional[NPCRole] = None,
-                    archetype: Optional[PersonalityArchetype] = None,
-                    social_context: Optional[SocialContext] = None) -> NPCState:
-        """Use Claude to generate a contextual NPC with optional type specification"""
-        
-        # Auto-suggest types if not provided
-        if role is None:
+    def _resolve_npc_types(self, location: str,
+                          role: Optional[NPCRole],
+                          archetype: Optional[PersonalityArchetype],
+                          social_context: Optional[SocialContext]):
+        """Auto-suggest any NPC types not explicitly provided"""
+        if role is None and social_context is None:
+            # Joint suggestion scans the location once for both
+            role, social_context = NPCTypeGenerator.suggest_role_and_context(location)
+        elif role is None:
             role = NPCTypeGenerator.suggest_role_from_location(location)
-        
+        elif social_context is None:
+            social_context = NPCTypeGenerator.suggest_context_from_location(location)
+
         if archetype is None:
             archetype = NPCTypeGenerator.random_archetype()
-        
-        if social_context is None:
-            social_context = NPCTypeGenerator.suggest_context_from_location(location)
-        
+
+        return role, archetype, social_context
+
+    def _build_npc_prompt(self, location: str, context: str,
+                         role: NPCRole, archetype: PersonalityArchetype,
+                         social_context: SocialContext) -> str:
+        """Build the dynamic part of the NPC generation prompt.
+
+        The static instructions/schema live in _SYSTEM_NPC_GEN and are sent
+        as a cached system block.
+        """
+
         # Get type-specific additions for prompt
         type_context = NPCTypeGenerator.generate_prompt_additions(
             role, archetype, social_context
         )
-        
-        prompt = f"""Generate a realistic NPC character for a social interaction RPG.
 
-Location: {location}
+        return f"""Location: {location}
 Context: {context}
 
 NPC Type Context:
-{type_context}
-
-Create a character with:
-1. Name (first name only, or just role like "Barista")
-2. Age range (e.g., "early 20s", "mid-30s")
-3. Brief physical description (2-3 sentences, natural details)
-4. Personality traits (2-3 key traits that match the archetype)
-5. Brief background (1-2 sentences)
-6. 2-3 interests/hobbies
+{type_context}"""
 
-Make them feel like a real person you might encounter in this location.
-Keep it concise and natural.
-The personality should reflect the type context provided.
+    def _npc_from_content(self, content: str, role: NPCRole,
+                         archetype: PersonalityArchetype,
+                         social_context: SocialContext) -> NPCState:
+        """Parse a generation response into a typed NPCState"""
 
-Return ONLY valid JSON in this exact format:
-{{
-    "name": "string",
-    "age_range": "string",
-    "appearance": "string",
-    "personality": "string",
-    "background": "string",
-    "interests": ["string", "string"]
-}}"""
+        # Parse JSON response, stripping any markdown code fence
+        npc_data = orjson.loads(_extract_json(content))
 
-        response = self.client.messages.create(
-            model="claude-opus-4-20250514",
-            max_tokens=500,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        # Parse JSON response
-        content = response.content[0].text.strip()
-        # Remove markdown code blocks if present
-        if content.startswith("```"):
-            content = content.split("```")[1]
-            if content.startswith("json"):
-                content = content[4:]
-        content = content.strip()
-        
-        npc_data = json.loads(content)
-        
         # Create full description
         description = f"{npc_data['age_range']}, {npc_data['appearance']}"
-        
+
         # Create NPC state
         npc = NPCState(
             name=npc_data['name'],
@@ -324,16 +981,123 @@ Return ONLY valid JSON in this exact format:
         )
         
         # Apply type modifiers
-        role_mods = NPCTypeSystem.get_role_modifiers(role)
-        arch_mods = NPCTypeSystem.get_archetype_modifiers(archetype)
-        ctx_mods = NPCTypeSystem.get_context_modifiers(social_context)
-        
-        combined_mods = NPCTypeSystem.combine_modifiers(role_mods, arch_mods, ctx_mods)
-        
-        NPCTypeSystem.apply_modifiers_to_npc(npc, combined_mods)
-        
+        NPCTypeSystem.apply_modifiers_to_npc(
+            npc, _combined_mods(role, archetype, social_context))
+
         return npc
-    
+
+    def pregenerate_npc_pool(self, location: str, n: int = 50, context: str = "",
+                             poll_interval: float = 5.0) -> int:
+        """Pre-generate a pool of NPCs for a location via the Batch API.
+
+        Batch requests are billed at half price, so filling the pool at
+        session start halves NPC generation spend and amortizes network
+        overhead across the whole pool. generate_npc pops from the pool
+        and only makes a live call on a miss. Returns the number of NPCs
+        added.
+        """
+        requests = []
+        resolved = []
+        for i in range(n):
+            role, archetype, social_context = self._resolve_npc_types(
+                location, None, None, None
+            )
+            resolved.append((role, archetype, social_context))
+            prompt = self._build_npc_prompt(
+                location, context, role, archetype, social_context
+            )
+            requests.append({
+                "custom_id": f"npc-{i}",
+                "params": {
+                    "model": self.MODEL_SMART,
+                    "max_tokens": 500,
+                    "system": _system_blocks(_SYSTEM_NPC_GEN),
+                    "messages": [{"role": "user", "content": prompt}],
+                },
+            })
+
+        batch = self.client.messages.batches.create(requests=requests)
+        while batch.processing_status != "ended":
+            time.sleep(poll_interval)
+            batch = self.client.messages.batches.retrieve(batch.id)
+
+        pool = self._npc_pools.setdefault(location, deque())
+        added = 0
+        for result in self.client.messages.batches.results(batch.id):
+            if result.result.type != "succeeded":
+                continue
+            index = int(result.custom_id.rsplit("-", 1)[1])
+            npc = self._npc_from_content(
+                result.result.message.content[0].text, *resolved[index]
+            )
+            pool.append(npc)
+            added += 1
+        return added
+
+    def generate_npc(self, location: str, context: str = "",
+                    role: Optional[NPCRole] = None,
+                    archetype: Optional[PersonalityArchetype] = None,
+                    social_context: Optional[SocialContext] = None) -> NPCState:
+        """Use Claude to generate a contextual NPC with optional type specification"""
+
+        # Serve from the pre-generated pool when the caller has no type
+        # constraints (pooled NPCs were rolled with auto-suggested types)
+        if role is None and archetype is None and social_context is None:
+            pool = self._npc_pools.get(location)
+            if pool:
+                return pool.popleft()
+
+        role, archetype, social_context = self._resolve_npc_types(
+            location, role, archetype, social_context
+        )
+        prompt = self._build_npc_prompt(location, context, role, archetype, social_context)
+
+        content = self._cached_message(prompt, max_tokens=500, model=self.MODEL_SMART,
+                                       system=_SYSTEM_NPC_GEN)
+
+        return self._npc_from_content(content, role, archetype, social_context)
+
+    def generate_npcs(self, specs: List[Dict]) -> List[NPCState]:
+        """Generate several NPCs with the LLM calls issued concurrently.
+
+        Each spec is a dict of generate_npc keyword arguments (location
+        required). Network waits overlap via the async client, capped at
+        _MAX_CONCURRENT_REQUESTS in flight.
+        """
+        resolved = []
+        prompts = []
+        for spec in specs:
+            location = spec['location']
+            role, archetype, social_context = self._resolve_npc_types(
+                location, spec.get('role'), spec.get('archetype'),
+                spec.get('social_context')
+            )
+            resolved.append((role, archetype, social_context))
+            prompts.append(self._build_npc_prompt(
+                location, spec.get('context', ''), role, archetype, social_context
+            ))
+
+        async def gather_responses():
+            semaphore = asyncio.Semaphore(_MAX_CONCURRENT_REQUESTS)
+
+            async def fetch(prompt):
+                async with semaphore:
+                    return await self.async_client.messages.create(
+                        model=self.MODEL_SMART,
+                        max_tokens=500,
+                        system=_system_blocks(_SYSTEM_NPC_GEN),
+                        messages=[{"role": "user", "content": prompt}]
+                    )
+
+            return await asyncio.gather(*(fetch(p) for p in prompts))
+
+        responses = asyncio.run(gather_responses())
+
+        return [
+            self._npc_from_content(response.content[0].text, *types)
+            for response, types in zip(responses, resolved)
+        ]
+
     # ========================================================================
     # ATTRACTION SYSTEM
     # ========================================================================
@@ -345,17 +1109,11 @@ Return ONLY valid JSON in this exact format:
         B) Platonic - friendly, wants to chat
         C) Romantic - attracted to them
         """
-        attraction_map = {
-            'A': AttractionLevel.NEUTRAL,
-            'B': AttractionLevel.PLATONIC,
-            'C': AttractionLevel.ROMANTIC
-        }
-        
-        attraction = attraction_map.get(approach_choice, AttractionLevel.NEUTRAL)
+        attraction = _ATTRACTION_MAP.get(approach_choice, AttractionLevel.NEUTRAL)
         
         # Roll NPC's attraction if romantic approach
         if attraction == AttractionLevel.ROMANTIC:
-            roll = random.randint(1, 100)
+            roll = self._rng.randint(1, 100)
             if roll <= 5:  # 5% - No attraction
                 npc.base_flirt_success = 10
             elif roll <= 20:  # 15% - Low attraction  
@@ -370,33 +1128,138 @@ Return ONLY valid JSON in this exact format:
                 npc.base_flirt_success = NPCTypeSystem.adjust_flirt_success(
                     npc.base_flirt_success, npc.type_modifiers
                 )
-        
+
+            # Base rate changed: drop any flirt closure compiled for the old one
+            npc._flirt_fn = None
+            npc._stats_version += 1
+
         return attraction
     
     # ========================================================================
     # DIALOGUE GENERATION
     # ========================================================================
     
-    def generate_dialogue_choices(self, context: InteractionContext, 
+    def generate_dialogue_choices(self, context: InteractionContext,
                                   current_situation: str) -> List[DialogueChoice]:
         """Use Claude to generate 4 dialogue choices with varying risk levels"""
-        
-        # Build context for Claude
-        player_stats = asdict(context.player)
-        npc_state = {
-            'name': context.npc.name,
-            'description': context.npc.description,
-            'personality': context.npc.personality,
-            'interests': context.npc.interests,
-            'receptiveness': context.npc.receptiveness,
-            'bond': context.npc.bond,
-            'consecutive_positives': context.npc.consecutive_positives,
-            'attraction': context.npc.attraction_level.value,
-            'role': context.npc.role.value if context.npc.role else 'unknown',
-            'archetype': context.npc.archetype.value if context.npc.archetype else 'unknown',
-            'social_context': context.npc.social_context.value if context.npc.social_context else 'unknown'
-        }
-        
+
+        # Use the speculative prefetch from the previous resolve if it
+        # already finished; otherwise abandon it and ask fresh
+        task = self._next_choices_task
+        if task is not None:
+            self._next_choices_task = None
+            if task.done() and not task.cancelled() and task.exception() is None:
+                return task.result()
+            task.cancel()
+
+        bucket = _dialogue_bucket(context.npc)
+        cached = self._dialogue_cache.get(bucket)
+        if cached is not None:
+            # Reshuffle so a repeated bucket doesn't read identically
+            choices = list(cached)
+            self._rng.shuffle(choices)
+            return choices
+
+        prompt = self._build_choices_prompt(context, current_situation)
+        content = self._cached_message(prompt, max_tokens=700, model=self.MODEL_FAST,
+                                       system=_SYSTEM_DIALOGUE_GEN)
+        choices = self._choices_from_content(content)
+        self._store_dialogue_bucket(bucket, choices)
+        return choices
+
+    async def generate_dialogue_choices_async(self, context: InteractionContext,
+                                              current_situation: str) -> List[DialogueChoice]:
+        """Async variant of generate_dialogue_choices; awaits any prefetch"""
+        task = self._next_choices_task
+        if task is not None:
+            self._next_choices_task = None
+            try:
+                return await task
+            except Exception:
+                pass  # Prefetch failed; fall through to a fresh request
+
+        bucket = _dialogue_bucket(context.npc)
+        cached = self._dialogue_cache.get(bucket)
+        if cached is not None:
+            choices = list(cached)
+            self._rng.shuffle(choices)
+            return choices
+
+        choices = await self._request_choices_async(context, current_situation)
+        self._store_dialogue_bucket(bucket, choices)
+        return choices
+
+    def _store_dialogue_bucket(self, bucket: tuple, choices: List[DialogueChoice]):
+        """Insert into the bucketed dialogue cache, evicting the oldest entry"""
+        if len(self._dialogue_cache) >= _DIALOGUE_CACHE_MAX:
+            self._dialogue_cache.pop(next(iter(self._dialogue_cache)))
+        self._dialogue_cache[bucket] = choices
+
+    def prefetch_dialogue_choices(self, context: InteractionContext,
+                                  current_situation: str) -> None:
+        """Generate and cache choices for a predicted next turn.
+
+        Meant to run on a background (daemon) thread while the game waits
+        on user input. Always asks fresh (no cache probe) and deposits
+        the result in the bucketed dialogue cache, where the next
+        generate_dialogue_choices call picks it up if the NPC is still in
+        the same bucket. Best-effort: failures are swallowed and the
+        sync path simply asks fresh.
+        """
+        bucket = _dialogue_bucket(context.npc)
+        prompt = self._build_choices_prompt(context, current_situation)
+        try:
+            content = self._cached_message(prompt, max_tokens=700, model=self.MODEL_FAST,
+                                           system=_SYSTEM_DIALOGUE_GEN)
+            choices = self._choices_from_content(content)
+        except Exception:
+            return  # Speculative only
+        self._store_dialogue_bucket(bucket, choices)
+
+    async def _request_choices_async(self, context: InteractionContext,
+                                     current_situation: str) -> List[DialogueChoice]:
+        """Issue one async dialogue-choice request (no prefetch handling)"""
+        prompt = self._build_choices_prompt(context, current_situation)
+        response = await self.async_client.messages.create(
+            model=self.MODEL_FAST,
+            max_tokens=700,
+            system=_system_blocks(_SYSTEM_DIALOGUE_GEN),
+            messages=[{"role": "user", "content": prompt}]
+        )
+        return self._choices_from_content(response.content[0].text)
+
+    def _build_choices_prompt(self, context: InteractionContext,
+                              current_situation: str) -> str:
+        """Build the dialogue-choice prompt for the current turn"""
+
+        # Build context for Claude. The serialized state is reused across
+        # turns while neither player nor NPC has mutated.
+        state_key = (id(context.player), context.player._stats_version,
+                     id(context.npc), context.npc._stats_version)
+        if state_key != self._state_json_key:
+            player_stats = {name: value for name, value in asdict(context.player).items()
+                            if not name.startswith('_')}
+            npc_state = {
+                'name': context.npc.name,
+                'description': context.npc.description,
+                'personality': context.npc.personality,
+                'interests': context.npc.interests,
+                'receptiveness': context.npc.receptiveness,
+                'bond': context.npc.bond,
+                'consecutive_positives': context.npc.consecutive_positives,
+                'attraction': context.npc.attraction_level.value,
+                'role': context.npc.role.value,
+                'archetype': context.npc.archetype.value,
+                'social_context': context.npc.social_context.value
+            }
+            self._state_json_key = state_key
+            # Compact form: the model parses it just as well and it costs
+            # a fraction of the input tokens of the indented version
+            self._state_json_val = (orjson.dumps(player_stats).decode(),
+                                    orjson.dumps(npc_state).decode())
+        player_json, npc_json = self._state_json_val
+
+
         # Add type-specific context
         type_notes = ""
         if context.npc.type_modifiers:
@@ -416,84 +1279,41 @@ Return ONLY valid JSON in this exact format:
             if notes:
                 type_notes = f"\nNPC Type Notes: {'; '.join(notes)}"
         
-        prompt = f"""You are generating dialogue choices for a social interaction RPG.
-
-CURRENT SITUATION:
+        prompt = f"""CURRENT SITUATION:
 {current_situation}
 
 PLAYER STATS:
-{json.dumps(player_stats, indent=2)}
+{player_json}
 
 NPC STATE:
-{json.dumps(npc_state, indent=2)}{type_notes}
+{npc_json}{type_notes}
 
 DOMAIN ACTIVE: {context.domain_active or "None"}
 MOMENTUM BONUS: +{context.momentum_bonus}%
 
-CRITICAL RULES:
-1. Generate EXACTLY 4 dialogue choices
-2. ONE must be Safe (75-92% base success)
-3. ONE must be Moderate (55-75% base success)  
-4. ONE must be Risky (35-55% base success)
-5. ONE must be Very Risky (<35% base success)
-6. RANDOMIZE the order - do not present in order of risk
-7. Each choice should feel natural and distinct
-8. Consider NPC type notes when generating options
-
-RISK FACTORS:
-- Safe: Simple, low-stakes, agreeable
-- Moderate: Mild challenge, personal question, light disagreement
-- Risky: Bold statement, vulnerable admission, challenging their view
-- Very Risky: Very personal too soon, controversial, pushy
-
 For {context.npc.attraction_level.value} interaction:
 - Include appropriate flirt options if romantic
 - Keep platonic options friendly but not flirty
-- Keep neutral options transactional
+- Keep neutral options transactional"""
 
-Return ONLY valid JSON array with 4 choices:
-[
-    {{
-        "text": "exact dialogue text",
-        "risk_level": "safe|moderate|risky|very_risky",
-        "base_success_rate": number (match risk level guidelines),
-        "is_flirt": boolean,
-        "topic": "optional topic string"
-    }}
-]"""
+        return prompt
+
+    def _choices_from_content(self, content: str) -> List[DialogueChoice]:
+        """Parse a dialogue-choice response into DialogueChoice objects"""
+        choices_data = orjson.loads(_extract_json(content))
 
-        response = self.client.messages.create(
-            model="claude-opus-4-20250514",
-            max_tokens=800,
-            messages=[{"role": "user", "content": prompt}]
-        )
-        
-        content = response.content[0].text.strip()
-        if content.startswith("```"):
-            content = content.split("```")[1]
-            if content.startswith("json"):
-                content = content[4:]
-        content = content.strip()
-        
-        choices_data = json.loads(content)
-        
         # Convert to DialogueChoice objects
         choices = []
         for choice_data in choices_data:
-            risk_map = {
-                'safe': RiskLevel.SAFE,
-                'moderate': RiskLevel.MODERATE,
-                'risky': RiskLevel.RISKY,
-                'very_risky': RiskLevel.VERY_RISKY
-            }
-            
             choice = DialogueChoice(
                 text=choice_data['text'],
-                risk_level=risk_map[choice_data['risk_level']],
+                risk_level=_RISK_MAP[choice_data['risk_level']],
                 base_success_rate=choice_data['base_success_rate'],
                 requires_stats={},  # Could be populated based on choice content
                 is_flirt=choice_data.get('is_flirt', False),
-                topic=choice_data.get('topic')
+                topic=choice_data.get('topic'),
+                success_response=choice_data.get('success_response'),
+                failure_response=choice_data.get('failure_response')
             )
             choices.append(choice)
         
@@ -502,76 +1322,176 @@ Return ONLY valid JSON array with 4 choices:
     # ========================================================================
     # DIALOGUE RESOLUTION
     # ========================================================================
-    
-    def resolve_choice(self, choice: DialogueChoice, context: InteractionContext) -> Tuple[bool, ExchangeOutcome, str]:
+
+    def filter_choices(self, choices: List[DialogueChoice],
+                       player: CharacterStats) -> List[DialogueChoice]:
+        """Screen candidate choices against the player's stats.
+
+        Compares each choice's packed requirement vector against the
+        player's stat tuple positionally - no per-stat dict iteration.
+        """
+        player_vec = player.stats_vector()
+        return [choice for choice in choices
+                if all(p >= r for p, r in zip(player_vec, choice._req_vec))]
+
+    def score_choices(self, choices: List[DialogueChoice],
+                      context: InteractionContext) -> List[int]:
+        """Batch-score candidate choices: effective success rate per choice.
+
+        One pass over the candidate list with the cap table and momentum
+        bound to locals, so UIs can show odds for every option without
+        paying per-choice method dispatch.
+        """
+        caps = _MOMENTUM_CAPS
+        momentum = context.momentum_bonus
+        npc = context.npc
+        romantic = npc.attraction_level == AttractionLevel.ROMANTIC
+        scores = []
+        for choice in choices:
+            if choice.is_flirt and romantic:
+                scores.append(npc.get_flirt_success_rate())
+            else:
+                cap = caps[choice.risk_level]
+                scores.append(choice.base_success_rate +
+                              (momentum if momentum < cap else cap))
+        return scores
+
+    def resolve_choice(self, choice: DialogueChoice, context: InteractionContext,
+                       on_text=None) -> Tuple[bool, ExchangeOutcome, str]:
         """
         Resolve a dialogue choice
         Returns: (success, outcome, response_text)
+
+        With an on_text callback the NPC response streams through it as it
+        generates, so the caller can render tokens immediately.
         """
         
+        success = self._roll_choice(choice, context)
+
+        # Generate NPC response using Claude
+        response_text = self._generate_npc_response(choice, context, success,
+                                                    on_text=on_text)
+
+        # Determine outcome and apply state changes
+        outcome = self._determine_outcome(choice, success, context)
+        self._apply_outcome(outcome, choice, context, success)
+
+        return success, outcome, response_text
+
+    async def resolve_choice_async(self, choice: DialogueChoice,
+                                   context: InteractionContext) -> Tuple[bool, ExchangeOutcome, str]:
+        """Resolve a choice with the NPC reply generated concurrently.
+
+        The reply depends only on the success roll, so the LLM call is
+        started first and the outcome/state updates run while it is in
+        flight instead of waiting behind it.
+        """
+        success = self._roll_choice(choice, context)
+
+        # Reply pre-rolled with the choice: no second LLM call needed
+        pre_rolled = choice.success_response if success else choice.failure_response
+        task = None
+        if pre_rolled is None:
+            # Prompt must capture pre-update state, so build it before applying
+            situation = self._build_response_prompt(choice, context, success)
+            task = asyncio.create_task(
+                self.async_client.messages.create(
+                    model=self.MODEL_FAST,
+                    max_tokens=96,
+                    system=_system_blocks(_SYSTEM_NPC_RESPONSE),
+                    messages=[{"role": "user", "content": situation}]
+                )
+            )
+
+        outcome = self._determine_outcome(choice, success, context)
+        self._apply_outcome(outcome, choice, context, success)
+
+        # Speculatively fetch next turn's choices while the player reads
+        # the NPC reply; generate_dialogue_choices picks the result up
+        if success:
+            self._next_choices_task = asyncio.create_task(
+                self._request_choices_async(context, "[conversation continues]"))
+
+        if task is None:
+            return success, outcome, pre_rolled
+        response = await task
+        return success, outcome, response.content[0].text.strip()
+
+    def _roll_choice(self, choice: DialogueChoice,
+                     context: InteractionContext) -> bool:
+        """Compute the effective success rate and roll against it"""
+
         # Calculate success rate
         success_rate = choice.base_success_rate
-        
+
         # Add momentum bonus (capped by risk level)
         momentum_cap = context.get_momentum_cap(choice.risk_level)
         actual_momentum = min(context.momentum_bonus, momentum_cap)
         success_rate += actual_momentum
-        
+
         # Add domain bonuses if applicable
         if choice.topic and context.domain_active:
             bonuses = context.player.get_domain_bonus(choice.topic)
             # Domain bonuses could add 5-10% based on relevant stats
-            domain_boost = sum(bonuses.values()) * 2  # 2% per bonus point
+            domain_boost = sum(bonuses) * 2  # 2% per bonus point
             success_rate += domain_boost
-        
+
         # Flirt success rate (for romantic interactions)
         if choice.is_flirt and context.npc.attraction_level == AttractionLevel.ROMANTIC:
             flirt_rate = context.npc.get_flirt_success_rate()
             success_rate = flirt_rate  # Flirt has its own success calculation
-        
+
         # Roll for success
-        roll = random.randint(1, 100)
-        success = roll <= success_rate
-        
-        # Generate NPC response using Claude
-        response_text = self._generate_npc_response(choice, context, success)
-        
-        # Determine outcome and apply state changes
-        outcome = self._determine_outcome(choice, success, context)
-        self._apply_outcome(outcome, choice, context, success)
-        
-        return success, outcome, response_text
-    
-    def _generate_npc_response(self, choice: DialogueChoice, 
-                               context: InteractionContext, success: bool) -> str:
+        roll = self._rng.randint(1, 100)
+        return roll <= success_rate
+
+    def _generate_npc_response(self, choice: DialogueChoice,
+                               context: InteractionContext, success: bool,
+                               on_text=None) -> str:
         """Generate NPC's response to player's dialogue choice"""
-        
-        situation = f"""PLAYER SAID: "{choice.text}"
+        npc = context.npc
+
+        # Reply pre-rolled alongside the choice itself: pick it locally and
+        # the whole turn costs a single LLM round trip
+        text = choice.success_response if success else choice.failure_response
+        if text:
+            if on_text is not None:
+                on_text(text)
+            return text
+
+        # Early-conversation filler: while the NPC is still near starting
+        # state (no bond, receptiveness in the typical starting band) a
+        # canned line reads fine and skips the LLM call entirely
+        if npc.bond < 1.0 and 1.0 <= npc.receptiveness <= 4.0:
+            text = self._rng.choice(
+                _TEMPLATED_RESPONSES[npc.attraction_level, success]
+            ).format(name=npc.name)
+            if on_text is not None:
+                on_text(text)
+            return text
+
+        situation = self._build_response_prompt(choice, context, success)
+        return self._cached_message(situation, max_tokens=96, model=self.MODEL_FAST,
+                                    system=_SYSTEM_NPC_RESPONSE,
+                                    on_text=on_text).strip()
+
+    def _build_response_prompt(self, choice: DialogueChoice,
+                               context: InteractionContext, success: bool) -> str:
+        """Build the NPC-response prompt for the current exchange"""
+
+        return f"""PLAYER SAID: "{choice.text}"
 CHOICE RISK: {choice.risk_level.value}
 OUTCOME: {"SUCCESS" if success else "FAILURE"}
 
+TONE: {"Warm and engaged" if success else "Cooler or pulling back"}
+
 NPC: {context.npc.name}
 Personality: {context.npc.personality}
-Current Receptiveness: {context.npc.receptiveness}/10
-Current Bond: {context.npc.bond}/10
+Current Receptiveness: {context.npc.receptiveness:.1f}/10
+Current Bond: {context.npc.bond:.1f}/10
 Attraction: {context.npc.attraction_level.value}
 
-Generate the NPC's response. Should be:
-- Natural and conversational
-- Reflect their personality
-- Match the success/failure outcome
-- {"Warm and engaged" if success else "Cooler or pulling back"}
-- 1-3 sentences typically
-
 Response:"""
-
-        response = self.client.messages.create(
-            model="claude-opus-4-20250514",
-            max_tokens=200,
-            messages=[{"role": "user", "content": situation}]
-        )
-        
-        return response.content[0].text.strip()
     
     def _determine_outcome(self, choice: DialogueChoice, success: bool, 
                           context: InteractionContext) -> ExchangeOutcome:
@@ -579,16 +1499,11 @@ Response:"""
         
         if not success:
             return ExchangeOutcome.FAILED
-        
-        # Successful exchanges vary by risk and bond
-        if choice.risk_level == RiskLevel.VERY_RISKY and context.npc.bond >= 4.0:
-            return ExchangeOutcome.VERY_POSITIVE
-        elif choice.risk_level in [RiskLevel.RISKY, RiskLevel.VERY_RISKY]:
-            return ExchangeOutcome.VERY_POSITIVE if random.random() > 0.5 else ExchangeOutcome.POSITIVE
-        elif choice.risk_level == RiskLevel.MODERATE:
-            return ExchangeOutcome.POSITIVE
-        else:  # SAFE
-            return ExchangeOutcome.POSITIVE if random.random() > 0.3 else ExchangeOutcome.NEUTRAL
+
+        # Successful exchanges vary by risk and bond: one draw, one probe
+        above, below, threshold = _OUTCOME_TABLE[
+            choice.risk_level, context.npc.bond >= 4.0]
+        return above if self._rng.random() > threshold else below
     
     def _apply_outcome(self, outcome: ExchangeOutcome, choice: DialogueChoice,
                       context: InteractionContext, success: bool):
@@ -602,45 +1517,16 @@ Response:"""
         # SOCIAL BATTERY CHANGES (Harsher system)
         # ====================================================================
         
-        if attraction == AttractionLevel.ROMANTIC:
-            battery_changes = {
-                ExchangeOutcome.VERY_POSITIVE: random.randint(2, 3),
-                ExchangeOutcome.POSITIVE: random.randint(1, 2),
-                ExchangeOutcome.NEUTRAL: random.randint(-3, -4),
-                ExchangeOutcome.NEGATIVE: random.randint(-8, -10),
-                ExchangeOutcome.FAILED: -(random.randint(18, 20) + 4)  # Base + failed penalty
-            }
-        elif attraction == AttractionLevel.PLATONIC:
-            battery_changes = {
-                ExchangeOutcome.VERY_POSITIVE: 1,
-                ExchangeOutcome.POSITIVE: -1,
-                ExchangeOutcome.NEUTRAL: random.randint(-4, -5),
-                ExchangeOutcome.NEGATIVE: random.randint(-7, -9),
-                ExchangeOutcome.FAILED: -(random.randint(14, 16) + 4)
-            }
-        else:  # NEUTRAL
-            battery_changes = {
-                ExchangeOutcome.VERY_POSITIVE: 0,
-                ExchangeOutcome.POSITIVE: -2,
-                ExchangeOutcome.NEUTRAL: random.randint(-5, -6),
-                ExchangeOutcome.NEGATIVE: random.randint(-6, -8),
-                ExchangeOutcome.FAILED: -(random.randint(15, 17) + 4)
-            }
-        
-        player.social_battery += battery_changes[outcome]
-        
-        # Apply NPC type battery multiplier
+        battery_change = self._rng.randint(*_BATTERY_BOUNDS[attraction][outcome])
+
+        # Apply NPC type battery multiplier before touching the stat, so the
+        # +-50 clamp only ever sees the final value
         if npc.type_modifiers:
-            # Recalculate with multiplier
-            base_change = battery_changes[outcome]
-            adjusted_change = NPCTypeSystem.adjust_battery_drain(
-                base_change, npc.type_modifiers
+            battery_change = NPCTypeSystem.adjust_battery_drain(
+                battery_change, npc.type_modifiers
             )
-            # Replace the change
-            player.social_battery -= base_change  # Remove original
-            player.social_battery += adjusted_change  # Add adjusted
-        
-        player.social_battery = max(-50, min(50, player.social_battery))
+
+        player.social_battery = max(-50, min(50, player.social_battery + battery_change))
         
         # ====================================================================
         # EMOTIONAL BANDWIDTH CHANGES (More punishing)
@@ -656,32 +1542,7 @@ Response:"""
             player.emotional_bandwidth += approach_costs[attraction]
         
         # Exchange costs
-        if attraction == AttractionLevel.ROMANTIC:
-            bandwidth_changes = {
-                ExchangeOutcome.VERY_POSITIVE: random.randint(3, 5),
-                ExchangeOutcome.POSITIVE: random.randint(1, 2),
-                ExchangeOutcome.NEUTRAL: random.randint(-4, -5),
-                ExchangeOutcome.NEGATIVE: random.randint(-8, -10),
-                ExchangeOutcome.FAILED: -(random.randint(18, 26))  # 18 base + 3 failed + 5 sting
-            }
-        elif attraction == AttractionLevel.PLATONIC:
-            bandwidth_changes = {
-                ExchangeOutcome.VERY_POSITIVE: random.randint(1, 2),
-                ExchangeOutcome.POSITIVE: 0,
-                ExchangeOutcome.NEUTRAL: random.randint(-6, -7),
-                ExchangeOutcome.NEGATIVE: random.randint(-7, -9),
-                ExchangeOutcome.FAILED: -(random.randint(10, 13) + 3)
-            }
-        else:  # NEUTRAL
-            bandwidth_changes = {
-                ExchangeOutcome.VERY_POSITIVE: 0,
-                ExchangeOutcome.POSITIVE: -2,
-                ExchangeOutcome.NEUTRAL: random.randint(-7, -8),
-                ExchangeOutcome.NEGATIVE: random.randint(-6, -8),
-                ExchangeOutcome.FAILED: -(random.randint(9, 12) + 3)
-            }
-        
-        player.emotional_bandwidth += bandwidth_changes[outcome]
+        player.emotional_bandwidth += self._rng.randint(*_BANDWIDTH_BOUNDS[attraction][outcome])
         
         # Special rejection penalty for contact exchange failures
         if choice.is_flirt and not success:
@@ -693,28 +1554,12 @@ Response:"""
         # NPC STATE CHANGES
         # ====================================================================
         
-        # Receptiveness changes (gradual)
-        if outcome == ExchangeOutcome.VERY_POSITIVE:
-            npc.receptiveness += random.uniform(0.75, 1.0)
-        elif outcome == ExchangeOutcome.POSITIVE:
-            npc.receptiveness += random.uniform(0.25, 0.5)
-        elif outcome == ExchangeOutcome.NEUTRAL:
-            npc.receptiveness += random.uniform(-0.25, 0)
-        elif outcome == ExchangeOutcome.FAILED:
-            npc.receptiveness += random.uniform(-0.5, -1.0)
-        
+        # Receptiveness changes (gradual, table-driven by outcome)
+        npc.receptiveness += self._rng.uniform(*_RECEPTIVENESS_DRIFT[outcome])
         npc.receptiveness = max(0, min(10, npc.receptiveness))
-        
-        # Bond changes (gradual)
-        if outcome == ExchangeOutcome.VERY_POSITIVE:
-            npc.bond += random.uniform(0.75, 1.0)
-        elif outcome == ExchangeOutcome.POSITIVE:
-            npc.bond += random.uniform(0.25, 0.5)
-        elif outcome == ExchangeOutcome.NEUTRAL:
-            npc.bond += random.uniform(-0.25, 0)
-        elif outcome == ExchangeOutcome.FAILED:
-            npc.bond += random.uniform(-0.25, -0.5)
-        
+
+        # Bond changes (gradual, table-driven by outcome)
+        npc.bond += self._rng.uniform(*_BOND_DRIFT[outcome])
         npc.bond = max(0, min(10, npc.bond))
         
         # Momentum tracking
@@ -732,6 +1577,9 @@ Response:"""
         # Flirt tracking
         if choice.is_flirt:
             npc.flirt_uses += 1
+
+        player._stats_version += 1
+        npc._stats_version += 1
     
     # ========================================================================
     # ACTING/DISINTEREST SYSTEM
@@ -750,30 +1598,19 @@ Response:"""
         
         # Romantic interactions have 50% reduction
         multiplier = 0.5 if context.npc.attraction_level == AttractionLevel.ROMANTIC else 1.0
-        
-        # Trigger rates by Acting stat
-        trigger_rates = {
-            0: 0.6,
-            1: 0.6,
-            2: 0.4,
-            3: 0.2,
-            4: 0.1,
-            5: 0.1
-        }
-        
-        rate = trigger_rates.get(context.player.acting, 0.4) * multiplier
-        
-        if random.random() < rate:
+
+        if _disinterest_roll(context.player.acting, multiplier, self._rng):
             context.npc.disinterest_signals += 1
             return True
-        
+
         return False
     
     def apply_disinterest_consequence(self, context: InteractionContext) -> str:
         """Apply consequences of showing disinterest"""
         
         signals = context.npc.disinterest_signals
-        
+        context.npc._stats_version += 1
+
         if signals == 1:
             # Mild
             context.npc.receptiveness -= 0.25
@@ -820,6 +1657,69 @@ Response:"""
         
         return False, ""
 
+# ============================================================================
+# SAVE / LOAD
+# ============================================================================
+
+def _orjson_default(obj):
+    """Fallback serializer: enums by value, dataclasses by shallow field walk.
+
+    The shallow walk skips asdict()'s recursive deep-copy; orjson re-enters
+    here for any nested dataclass/enum values.
+    """
+    if isinstance(obj, Enum):
+        return obj.value
+    if hasattr(obj, '__dataclass_fields__'):
+        # Underscore fields are derived caches (lowercase strings, compiled
+        # closures); they are rebuilt on load, not persisted
+        return {name: getattr(obj, name) for name in obj.__dataclass_fields__
+                if not name.startswith('_')}
+    raise TypeError(f"Cannot serialize {type(obj).__name__}")
+
+def dumps_state(player: CharacterStats, npc: Optional[NPCState] = None) -> bytes:
+    """Serialize game state to bytes for saving"""
+    state = {'player': player, 'npc': npc}
+    return orjson.dumps(state, default=_orjson_default)
+
+def loads_state(blob: bytes) -> Tuple[CharacterStats, Optional[NPCState]]:
+    """Deserialize game state produced by dumps_state"""
+    state = orjson.loads(blob)
+
+    player_data = {k: v for k, v in state['player'].items()
+                   if not k.startswith('_')}
+    player = CharacterStats(**player_data)
+
+    npc = None
+    if state['npc'] is not None:
+        npc_data = dict(state['npc'])
+        for key, enum_cls in (('role', NPCRole),
+                              ('archetype', PersonalityArchetype),
+                              ('social_context', SocialContext),
+                              ('attraction_level', AttractionLevel)):
+            if npc_data.get(key) is not None:
+                npc_data[key] = enum_cls(npc_data[key])
+        if npc_data.get('type_modifiers') is not None:
+            npc_data['type_modifiers'] = NPCTypeModifiers(**npc_data['type_modifiers'])
+        npc = NPCState(**npc_data)
+
+    return player, npc
+
+def dumps_state_binary(player: CharacterStats, npc: Optional[NPCState] = None) -> bytes:
+    """Serialize game state to the compact binary save format.
+
+    Python-only saves skip JSON stringification entirely: pickle protocol 5
+    packs the dataclasses (enums included) directly, producing smaller blobs
+    that load without any re-hydration step. Use dumps_state for saves that
+    other tools need to read.
+    """
+    return pickle.dumps({'player': player, 'npc': npc},
+                        protocol=pickle.HIGHEST_PROTOCOL)
+
+def loads_state_binary(blob: bytes) -> Tuple[CharacterStats, Optional[NPCState]]:
+    """Deserialize game state produced by dumps_state_binary"""
+    state = pickle.loads(blob)
+    return state['player'], state['npc']
+
 # ============================================================================
 # EXAMPLE USAGE
 # ============================================================================
@@ -828,7 +1728,7 @@ def main():
     """Example game session"""
     
     # Initialize game
-    api_key = os.getenv("ANTHROPIC_API_KEY")
+    api_key = os.getenv("ANTHROPIC_API_KEY") or os.getenv("ANTHROPIC_AUTH_TOKEN")
     if not api_key:
         print("Please set ANTHROPIC_API_KEY environment variable")
         return
@@ -873,9 +1773,9 @@ def main():
     print(f"\nYou encounter: {npc.name}")
     print(f"Description: {npc.description}")
     print(f"Personality: {npc.personality}")
-    print(f"Role: {npc.role.value if npc.role else 'Unknown'}")
-    print(f"Archetype: {npc.archetype.value if npc.archetype else 'Unknown'}")
-    print(f"Context: {npc.social_context.value if npc.social_context else 'Unknown'}")
+    print(f"Role: {npc.role.value}")
+    print(f"Archetype: {npc.archetype.value}")
+    print(f"Context: {npc.social_context.value}")
     if npc.type_modifiers:
         print(f"Starting Receptiveness: {npc.receptiveness:.1f}/10 (type-modified)")
         print(f"Time Pressure: {'Yes' if npc.type_modifiers.time_pressure else 'No'}")
@@ -900,13 +1800,15 @@ def main():
     print()
     
     # Interaction loop
+    prefetch = None
     turn = 1
     while True:
-        print(f"\n--- Turn {turn} ---")
-        print(f"Battery: {player.social_battery}/50 | Bandwidth: {player.emotional_bandwidth}/100")
-        print(f"Bond: {npc.bond:.1f} | Receptiveness: {npc.receptiveness:.1f}")
-        print(f"Consecutive Positives: {npc.consecutive_positives} (Momentum: +{context.momentum_bonus}%)")
-        print()
+        # One buffered write per burst: a turn header costs one flush
+        sys.stdout.write(
+            f"\n--- Turn {turn} ---\n"
+            f"Battery: {player.social_battery}/50 | Bandwidth: {player.emotional_bandwidth}/100\n"
+            f"Bond: {npc.bond:.1f} | Receptiveness: {npc.receptiveness:.1f}\n"
+            f"Consecutive Positives: {npc.consecutive_positives} (Momentum: +{context.momentum_bonus}%)\n\n")
         
         # Check if NPC should exit
         should_exit, exit_msg = game.should_npc_exit(context)
@@ -918,15 +1820,31 @@ def main():
         situation = f"Turn {turn} of conversation with {npc.name}. Previous exchanges have built bond to {npc.bond:.1f}."
         
         print("Generating dialogue options...")
+        if prefetch is not None:
+            prefetch.join()  # Lands in the dialogue cache (best-effort)
+            prefetch = None
         choices = game.generate_dialogue_choices(context, situation)
         
-        print("\nWhat do you say?")
+        option_lines = ["\nWhat do you say?"]
         for i, choice in enumerate(choices, 1):
             flirt_marker = " [FLIRT]" if choice.is_flirt else ""
-            print(f"{i}. {choice.text}{flirt_marker}")
-        
-        print("Q. End interaction")
-        
+            option_lines.append(f"{i}. {choice.text}{flirt_marker}")
+        option_lines.append("Q. End interaction\n")
+        sys.stdout.write("\n".join(option_lines))
+
+        # While the player reads the options and types, speculatively
+        # generate a refreshed set for the likely next turn. If the NPC
+        # stays in the same dialogue bucket, next turn's options are
+        # ready the moment they're needed. Daemon thread: an in-flight
+        # prefetch never delays quitting (non-daemon workers are joined
+        # at interpreter exit, stalling Q for up to the HTTP timeout).
+        prefetch = threading.Thread(
+            target=game.prefetch_dialogue_choices,
+            args=(context,
+                  f"Turn {turn + 1} of conversation with {npc.name}. [conversation continues]"),
+            daemon=True)
+        prefetch.start()
+
         player_choice = input("\nChoice: ")
         
         if player_choice.upper() == 'Q':
@@ -941,9 +1859,13 @@ def main():
             continue
         
         # Resolve choice
-        success, outcome, response = game.resolve_choice(selected_choice, context)
-        
-        print(f"\n{npc.name}: {response}")
+        # Stream the NPC's reply as it generates
+        print(f"\n{npc.name}: ", end="", flush=True)
+        success, outcome, response = game.resolve_choice(
+            selected_choice, context,
+            on_text=lambda text: print(text, end="", flush=True)
+        )
+        print()
         print(f"\nOutcome: {outcome.value} ({'SUCCESS' if success else 'FAILURE'})")
         
         turn += 1
@@ -4,90 +4,134 @@ Example script demonstrating different NPC type combinations
 Shows how role, archetype, and context combine to create varied NPCs
 """
 
+import sys
+from bisect import bisect_right
+from math import nextafter
+
 from npc_types import (
     NPCRole, PersonalityArchetype, SocialContext,
     NPCTypeSystem, NPCTypeGenerator
 )
 
+# Interpretation bands for interpret_combination: bisect_right into the
+# thresholds picks the string for the band the value falls in (values
+# exactly on a boundary classify upward).
+_RECEP_THRESHOLDS = (1.5, 2.0, 2.3)
+_RECEP_BANDS = (
+    "Very guarded and hard to approach",
+    "Somewhat reserved initially",
+    "Reasonably open to conversation",
+    "Very receptive and friendly",
+)
+
+# The battery ladder compared with strict >, so drains of exactly 1.1
+# and 1.3 (which real profiles produce, e.g. professional x balanced x
+# trapped) belong to the band below; nudging those thresholds one ulp
+# up reproduces that under bisect_right.
+_BATTERY_THRESHOLDS = (0.9, nextafter(1.1, 2), nextafter(1.3, 2))
+_BATTERY_BANDS = (
+    "easier on your social battery",
+    "standard social energy cost",
+    "moderately draining",
+    "exhausting to interact with",
+)
+
+# Short trait names for the table renderer
+_TRAIT_SHORT = (
+    ("time_pressure", True, "busy"),
+    ("carries_conversation", True, "talkative"),
+    ("comfortable_silence", True, "quiet-ok"),
+    ("critical_of_flirting", True, "anti-flirt"),
+    ("enthusiastic_about_interests", True, "enthusiast"),
+    ("exits_gracefully", False, "abrupt-exit"),
+)
+
+# Special-trait labels, keyed by (attribute, value that makes it notable)
+_TRAIT_LABELS = (
+    ("carries_conversation", True, "🗣️  Carries conversation (talkative)"),
+    ("comfortable_silence", True, "🤫 Comfortable with silence"),
+    ("critical_of_flirting", True, "🤨 Critical of flirting (-30%)"),
+    ("enthusiastic_about_interests", True, "✨ Enthusiastic about interests"),
+    ("exits_gracefully", False, "🚶 May exit abruptly"),
+)
+
 def print_npc_profile(role, archetype, context):
     """Print a detailed profile of an NPC type combination"""
     
-    print(f"\n{'='*70}")
-    print(f"NPC PROFILE")
-    print(f"{'='*70}")
-    print(f"Role: {role.value}")
-    print(f"Archetype: {archetype.value}")
-    print(f"Context: {context.value}")
-    print(f"{'-'*70}")
-    
-    # Get individual modifiers
-    role_mods = NPCTypeSystem.get_role_modifiers(role)
-    arch_mods = NPCTypeSystem.get_archetype_modifiers(archetype)
-    ctx_mods = NPCTypeSystem.get_context_modifiers(context)
-    
-    # Combine
-    combined = NPCTypeSystem.combine_modifiers(role_mods, arch_mods, ctx_mods)
-    
-    # Display combined stats
-    print(f"\nStarting Stats:")
-    print(f"  Receptiveness: {combined.base_receptiveness:.2f}/10")
-    print(f"  Bond: {combined.base_bond:.2f}/10")
-    
-    print(f"\nBehavioral Traits:")
-    print(f"  Conversation Patience: {combined.conversation_patience:.2f}x")
-    print(f"  Time Pressure: {'Yes ⏰' if combined.time_pressure else 'No'}")
-    print(f"  Domain Boost: +{int(combined.domain_boost * 100)}% for shared interests")
-    
-    print(f"\nPlayer Impact:")
-    print(f"  Battery Drain: {combined.battery_drain_multiplier:.2f}x")
-    print(f"  Failure Tolerance Mod: {combined.failure_tolerance_modifier:+d}")
-    
-    print(f"\nSpecial Traits:")
-    traits = []
-    if combined.carries_conversation:
-        traits.append("🗣️  Carries conversation (talkative)")
-    if combined.comfortable_silence:
-        traits.append("🤫 Comfortable with silence")
-    if combined.critical_of_flirting:
-        traits.append("🤨 Critical of flirting (-30%)")
-    if combined.enthusiastic_about_interests:
-        traits.append("✨ Enthusiastic about interests")
-    if not combined.exits_gracefully:
-        traits.append("🚶 May exit abruptly")
+    # Look up the precombined modifiers for this triple
+    combined = NPCTypeSystem.get_combined(role, archetype, context)
+    
+    # Accumulate the profile and emit it with a single write: one flush
+    # instead of ~20, which matters when output is piped to a log
+    lines = [
+        f"\n{'='*70}",
+        f"NPC PROFILE",
+        f"{'='*70}",
+        f"Role: {role.value}",
+        f"Archetype: {archetype.value}",
+        f"Context: {context.value}",
+        f"{'-'*70}",
+        f"\nStarting Stats:",
+        f"  Receptiveness: {combined.base_receptiveness:.2f}/10",
+        f"  Bond: {combined.base_bond:.2f}/10",
+        f"\nBehavioral Traits:",
+        f"  Conversation Patience: {combined.conversation_patience:.2f}x",
+        f"  Time Pressure: {'Yes ⏰' if combined.time_pressure else 'No'}",
+        f"  Domain Boost: +{int(combined.domain_boost * 100)}% for shared interests",
+        f"\nPlayer Impact:",
+        f"  Battery Drain: {combined.battery_drain_multiplier:.2f}x",
+        f"  Failure Tolerance Mod: {combined.failure_tolerance_modifier:+d}",
+        f"\nSpecial Traits:",
+    ]
     
+    traits = [label for attr, notable, label in _TRAIT_LABELS
+              if getattr(combined, attr) is notable]
     if traits:
-        for trait in traits:
-            print(f"  {trait}")
+        lines.extend(f"  {trait}" for trait in traits)
     else:
-        print(f"  None")
+        lines.append(f"  None")
     
-    print(f"\nInterpretation:")
-    print(f"  {interpret_combination(role, archetype, context, combined)}")
+    lines.append(f"\nInterpretation:")
+    lines.append(f"  {interpret_combination(role, archetype, context, combined)}")
+    sys.stdout.write("\n".join(lines) + "\n")
+
+def render_profiles_table(rows):
+    """Render a batch of NPC type combinations as one fixed-width table.
+
+    Returns a single string so the caller can emit the whole comparison
+    with one write instead of a print burst per profile.
+    """
+    header = ("Role", "Archetype", "Context", "Recep", "Bond",
+              "Patience", "Drain", "Tol", "Traits")
+    table = [header]
+    for role, archetype, context in rows:
+        combined = NPCTypeSystem.get_combined(role, archetype, context)
+        traits = ",".join(short for attr, notable, short in _TRAIT_SHORT
+                          if getattr(combined, attr) is notable) or "-"
+        table.append((
+            role.value, archetype.value, context.value,
+            f"{combined.base_receptiveness:.2f}",
+            f"{combined.base_bond:.2f}",
+            f"{combined.conversation_patience:.2f}x",
+            f"{combined.battery_drain_multiplier:.2f}x",
+            f"{combined.failure_tolerance_modifier:+d}",
+            traits,
+        ))
+    widths = [max(len(row[col]) for row in table) for col in range(len(header))]
+    lines = []
+    for i, row in enumerate(table):
+        lines.append("  ".join(cell.ljust(w) for cell, w in zip(row, widths)).rstrip())
+        if i == 0:
+            lines.append("  ".join("-" * w for w in widths))
+    return "\n".join(lines) + "\n"
 
 def interpret_combination(role, archetype, context, mods):
     """Generate a human-readable interpretation of the NPC type"""
     
-    interpretations = []
-    
-    # Receptiveness interpretation
-    if mods.base_receptiveness < 1.5:
-        interpretations.append("Very guarded and hard to approach")
-    elif mods.base_receptiveness < 2.0:
-        interpretations.append("Somewhat reserved initially")
-    elif mods.base_receptiveness < 2.3:
-        interpretations.append("Reasonably open to conversation")
-    else:
-        interpretations.append("Very receptive and friendly")
-    
-    # Battery interpretation
-    if mods.battery_drain_multiplier > 1.3:
-        interpretations.append("exhausting to interact with")
-    elif mods.battery_drain_multiplier > 1.1:
-        interpretations.append("moderately draining")
-    elif mods.battery_drain_multiplier < 0.9:
-        interpretations.append("easier on your social battery")
-    else:
-        interpretations.append("standard social energy cost")
+    interpretations = [
+        _RECEP_BANDS[bisect_right(_RECEP_THRESHOLDS, mods.base_receptiveness)],
+        _BATTERY_BANDS[bisect_right(_BATTERY_THRESHOLDS, mods.battery_drain_multiplier)],
+    ]
     
     # Special behaviors
     if mods.time_pressure:
@@ -108,47 +152,23 @@ def main():
     print(" NPC TYPE SYSTEM DEMONSTRATIONS")
     print("="*70)
     
-    # Example 1: Busy barista who's an introvert
-    print_npc_profile(
-        NPCRole.SERVICE_WORKER,
-        PersonalityArchetype.INTROVERT,
-        SocialContext.WORKING
-    )
-    
-    # Example 2: Enthusiastic party-goer
-    print_npc_profile(
-        NPCRole.SOCIAL,
-        PersonalityArchetype.ENTHUSIAST,
-        SocialContext.SOCIALIZING
-    )
-    
-    # Example 3: Skeptical stranger
-    print_npc_profile(
-        NPCRole.STRANGER,
-        PersonalityArchetype.SKEPTIC,
-        SocialContext.TASK_FOCUSED
-    )
-    
-    # Example 4: Extroverted neighbor
-    print_npc_profile(
-        NPCRole.NEIGHBOR,
-        PersonalityArchetype.EXTROVERT,
-        SocialContext.LEISURE
-    )
-    
-    # Example 5: Relaxed coffee shop browser
-    print_npc_profile(
-        NPCRole.LEISURE,
-        PersonalityArchetype.BALANCED,
-        SocialContext.LEISURE
-    )
-    
-    # Example 6: Professional contact at networking event
-    print_npc_profile(
-        NPCRole.PROFESSIONAL,
-        PersonalityArchetype.BALANCED,
-        SocialContext.SOCIALIZING
-    )
+    # One batched table render for all six example combinations; the
+    # detailed single-profile view stays available via print_npc_profile
+    examples = [
+        # Busy barista who's an introvert
+        (NPCRole.SERVICE_WORKER, PersonalityArchetype.INTROVERT, SocialContext.WORKING),
+        # Enthusiastic party-goer
+        (NPCRole.SOCIAL, PersonalityArchetype.ENTHUSIAST, SocialContext.SOCIALIZING),
+        # Skeptical stranger
+        (NPCRole.STRANGER, PersonalityArchetype.SKEPTIC, SocialContext.TASK_FOCUSED),
+        # Extroverted neighbor
+        (NPCRole.NEIGHBOR, PersonalityArchetype.EXTROVERT, SocialContext.LEISURE),
+        # Relaxed coffee shop browser
+        (NPCRole.LEISURE, PersonalityArchetype.BALANCED, SocialContext.LEISURE),
+        # Professional contact at networking event
+        (NPCRole.PROFESSIONAL, PersonalityArchetype.BALANCED, SocialContext.SOCIALIZING),
+    ]
+    sys.stdout.write("\n" + render_profiles_table(examples))
     
     print(f"\n{'='*70}")
     print("AUTO-SUGGESTION EXAMPLES")
@@ -165,8 +185,7 @@ def main():
     ]
     
     for location in locations:
-        suggested_role = NPCTypeGenerator.suggest_role_from_location(location)
-        suggested_context = NPCTypeGenerator.suggest_context_from_location(location)
+        suggested_role, suggested_context = NPCTypeGenerator.suggest_role_and_context(location)
         random_archetype = NPCTypeGenerator.random_archetype()
         
         print(f"Location: '{location}'")
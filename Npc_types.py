@@ -4,14 +4,21 @@ NPC Type System for Introvert Social RPG
 Adds role-based templates, personality archetypes, and contextual behaviors
 """
 
+import re
+from bisect import bisect
 from enum import Enum
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional
-import random
+from typing import Dict, List, Optional, Tuple
+
+# random is imported lazily at the few call sites that roll dice, so a
+# cold import of the type system pays only for the tables it builds
 
 # ============================================================================
 # ENUMS FOR NPC TYPES
 # ============================================================================
+# These stay string-valued Enums (not IntEnum ordinals): the .value
+# strings are embedded in LLM prompts and in the save-file format, and
+# the lookup tables keyed by members already hash by identity.
 
 class NPCRole(Enum):
     """Role-based NPC templates"""
@@ -22,6 +29,7 @@ class NPCRole(Enum):
     LEISURE = "leisure"                    # Coffee shop browser, park visitor
     NEIGHBOR = "neighbor"                  # Lives nearby, shared space
     REGULAR = "regular"                    # See them often but never talk
+    UNKNOWN = "unknown"                    # Sentinel: not yet typed
 
 class PersonalityArchetype(Enum):
     """Behavioral personality types"""
@@ -30,6 +38,7 @@ class PersonalityArchetype(Enum):
     SKEPTIC = "skeptic"                   # Low initial trust, critical
     ENTHUSIAST = "enthusiast"             # Gets excited about interests
     BALANCED = "balanced"                 # Average on all dimensions
+    UNKNOWN = "unknown"                   # Sentinel: not yet typed
 
 class SocialContext(Enum):
     """Why the NPC is at this location"""
@@ -38,12 +47,13 @@ class SocialContext(Enum):
     TRAPPED = "trapped"                    # Waiting, might be bored
     WORKING = "working"                    # On the job
     SOCIALIZING = "socializing"           # Explicitly here to meet people
+    UNKNOWN = "unknown"                    # Sentinel: not yet typed
 
 # ============================================================================
 # NPC TYPE MODIFIERS
 # ============================================================================
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class NPCTypeModifiers:
     """Modifiers applied based on NPC type"""
     
@@ -69,6 +79,279 @@ class NPCTypeModifiers:
     failure_tolerance_modifier: int = 0    # +/- to base failure tolerance
     exits_gracefully: bool = True          # How they leave
 
+# ============================================================================
+# MODIFIER TABLES
+# ============================================================================
+# Built once at import; the getters hand out shared instances, so callers
+# must treat them as read-only.
+
+_DEFAULT_MODS = NPCTypeModifiers()
+
+_ROLE_MODS = {
+    NPCRole.SERVICE_WORKER: NPCTypeModifiers(
+        base_receptiveness=1.5,      # Lower - they're working
+        conversation_patience=0.7,    # Less patient
+        time_pressure=True,           # Customers waiting
+        battery_drain_multiplier=1.2, # Slightly more draining
+        failure_tolerance_modifier=-1, # Less tolerant of mistakes
+        exits_gracefully=True
+    ),
+
+    NPCRole.PROFESSIONAL: NPCTypeModifiers(
+        base_receptiveness=2.0,
+        conversation_patience=1.0,
+        domain_boost=0.2,             # +20% when topics match profession
+        battery_drain_multiplier=1.1,
+        failure_tolerance_modifier=0,
+        exits_gracefully=True
+    ),
+
+    NPCRole.SOCIAL: NPCTypeModifiers(
+        base_receptiveness=2.5,       # Higher - here to socialize
+        conversation_patience=1.2,    # More patient
+        time_pressure=False,
+        battery_drain_multiplier=1.3, # More draining (high energy)
+        failure_tolerance_modifier=1, # More forgiving
+        exits_gracefully=True
+    ),
+
+    NPCRole.STRANGER: NPCTypeModifiers(
+        base_receptiveness=1.0,       # Very low - why are you talking to me?
+        conversation_patience=0.6,    # Not patient
+        time_pressure=True,           # Wants to get where they're going
+        battery_drain_multiplier=1.4, # Very draining (awkward)
+        failure_tolerance_modifier=-1,
+        exits_gracefully=False        # Might just walk away
+    ),
+
+    NPCRole.LEISURE: NPCTypeModifiers(
+        base_receptiveness=2.2,
+        conversation_patience=1.1,
+        time_pressure=False,
+        battery_drain_multiplier=0.9, # Less draining (relaxed vibe)
+        failure_tolerance_modifier=1,
+        exits_gracefully=True
+    ),
+
+    NPCRole.NEIGHBOR: NPCTypeModifiers(
+        base_receptiveness=2.0,
+        base_bond=0.25,               # Already familiar
+        conversation_patience=1.0,
+        time_pressure=False,
+        battery_drain_multiplier=0.9,
+        failure_tolerance_modifier=1, # More forgiving (see each other again)
+        exits_gracefully=True
+    ),
+
+    NPCRole.REGULAR: NPCTypeModifiers(
+        base_receptiveness=1.8,
+        base_bond=0.5,                # Recognize each other
+        conversation_patience=0.9,
+        time_pressure=False,
+        battery_drain_multiplier=1.0,
+        failure_tolerance_modifier=0,
+        exits_gracefully=True
+    )
+}
+
+_ARCH_MODS = {
+    PersonalityArchetype.EXTROVERT: NPCTypeModifiers(
+        base_receptiveness=2.5,
+        conversation_patience=1.3,    # Very patient
+        carries_conversation=True,    # Talks more
+        battery_drain_multiplier=1.4, # Exhausting
+        failure_tolerance_modifier=2, # Very forgiving
+        exits_gracefully=True
+    ),
+
+    PersonalityArchetype.INTROVERT: NPCTypeModifiers(
+        base_receptiveness=1.8,
+        conversation_patience=1.0,
+        comfortable_silence=True,     # Appreciates brevity
+        battery_drain_multiplier=0.7, # Less draining
+        failure_tolerance_modifier=0,
+        exits_gracefully=True
+    ),
+
+    PersonalityArchetype.SKEPTIC: NPCTypeModifiers(
+        base_receptiveness=1.3,       # Low initial trust
+        conversation_patience=0.8,
+        critical_of_flirting=True,    # 30% penalty to flirt success
+        battery_drain_multiplier=1.2,
+        failure_tolerance_modifier=-1,
+        exits_gracefully=False        # Might be blunt
+    ),
+
+    PersonalityArchetype.ENTHUSIAST: NPCTypeModifiers(
+        base_receptiveness=2.3,
+        conversation_patience=1.2,
+        domain_boost=0.3,             # +30% for shared interests
+        enthusiastic_about_interests=True,
+        battery_drain_multiplier=1.3,
+        failure_tolerance_modifier=1,
+        exits_gracefully=True
+    ),
+
+    PersonalityArchetype.BALANCED: NPCTypeModifiers(
+        base_receptiveness=2.0,
+        conversation_patience=1.0,
+        battery_drain_multiplier=1.0,
+        failure_tolerance_modifier=0,
+        exits_gracefully=True
+    )
+}
+
+# TRAPPED is absent from the table: get_context_modifiers rolls per call
+# between these two coherent profiles. The old inline version rolled each
+# field independently, so an NPC could get a bored receptiveness with a
+# frustrated patience.
+_TRAPPED_BORED = NPCTypeModifiers(
+    base_receptiveness=2.5,           # Welcome distraction from the wait
+    conversation_patience=1.1,
+    time_pressure=False,
+    battery_drain_multiplier=1.0,
+    failure_tolerance_modifier=1,
+    exits_gracefully=True
+)
+
+_TRAPPED_FRUSTRATED = NPCTypeModifiers(
+    base_receptiveness=1.5,           # The wait has worn them down
+    conversation_patience=0.7,
+    time_pressure=False,
+    battery_drain_multiplier=1.0,
+    failure_tolerance_modifier=-1,
+    exits_gracefully=True
+)
+
+_CTX_MODS = {
+    SocialContext.TASK_FOCUSED: NPCTypeModifiers(
+        base_receptiveness=1.7,
+        conversation_patience=0.8,
+        time_pressure=True,
+        battery_drain_multiplier=1.1,
+        failure_tolerance_modifier=-1,
+        exits_gracefully=True
+    ),
+
+    SocialContext.LEISURE: NPCTypeModifiers(
+        base_receptiveness=2.3,
+        conversation_patience=1.2,
+        time_pressure=False,
+        battery_drain_multiplier=0.9,
+        failure_tolerance_modifier=1,
+        exits_gracefully=True
+    ),
+
+    SocialContext.WORKING: NPCTypeModifiers(
+        base_receptiveness=1.5,
+        conversation_patience=0.7,
+        time_pressure=True,
+        battery_drain_multiplier=1.2,
+        failure_tolerance_modifier=-1,
+        exits_gracefully=True
+    ),
+
+    SocialContext.SOCIALIZING: NPCTypeModifiers(
+        base_receptiveness=2.5,
+        conversation_patience=1.3,
+        time_pressure=False,
+        battery_drain_multiplier=1.2,
+        failure_tolerance_modifier=2,
+        exits_gracefully=True
+    )
+}
+
+# Time-pressure flavor lines, unioned per (role, context) pair at import.
+# Only pairs where the role or the context actually applies time pressure
+# get an entry, so the runtime check is one dict probe.
+_ROLE_TP_LINES = {
+    NPCRole.SERVICE_WORKER: (
+        "glances at the line forming behind you",
+        "looks toward the other customers waiting",
+        "checks the order screen briefly"
+    ),
+    NPCRole.STRANGER: (
+        "checks their phone",
+        "glances down the street",
+        "shifts their weight, ready to move"
+    ),
+}
+
+_CTX_TP_LINES = {
+    SocialContext.TASK_FOCUSED: (
+        "glances at their shopping list",
+        "checks their watch",
+        "looks toward their destination"
+    ),
+    SocialContext.WORKING: (
+        "glances at their workstation",
+        "checks the time",
+        "looks around at other tasks"
+    ),
+}
+
+# Each entry carries (lines, count) so a draw is one probe plus one
+# randrange with no per-call len
+_TIME_PRESSURE_LINES: Dict[tuple, tuple] = {}
+for _role in NPCRole:
+    _role_tp = _ROLE_MODS.get(_role, _DEFAULT_MODS).time_pressure
+    for _ctx in SocialContext:
+        if _role_tp or _CTX_MODS.get(_ctx, _DEFAULT_MODS).time_pressure:
+            _lines = (_ROLE_TP_LINES.get(_role, ()) + _CTX_TP_LINES.get(_ctx, ())
+                      or ("seems a bit busy",))
+            _TIME_PRESSURE_LINES[_role, _ctx] = (_lines, len(_lines))
+del _role, _role_tp, _ctx, _lines
+
+# Merging is staged: the role+archetype half is folded into a partial
+# tuple once, then each context finishes it. The import-time precompute
+# reuses one partial per (role, archetype) pair across all contexts.
+
+def _combine_pair(role_mods: NPCTypeModifiers,
+                  archetype_mods: NPCTypeModifiers) -> tuple:
+    """Fold the role and archetype halves of a modifier merge"""
+    return (
+        role_mods.base_receptiveness + archetype_mods.base_receptiveness,
+        max(role_mods.base_bond, archetype_mods.base_bond),
+        role_mods.conversation_patience * archetype_mods.conversation_patience,
+        role_mods.time_pressure or archetype_mods.time_pressure,
+        role_mods.domain_boost + archetype_mods.domain_boost,
+        role_mods.battery_drain_multiplier * archetype_mods.battery_drain_multiplier,
+        # Special traits come from role and archetype only
+        role_mods.carries_conversation or archetype_mods.carries_conversation,
+        role_mods.comfortable_silence or archetype_mods.comfortable_silence,
+        role_mods.critical_of_flirting or archetype_mods.critical_of_flirting,
+        role_mods.enthusiastic_about_interests or archetype_mods.enthusiastic_about_interests,
+        role_mods.failure_tolerance_modifier + archetype_mods.failure_tolerance_modifier,
+        role_mods.exits_gracefully and archetype_mods.exits_gracefully,
+    )
+
+def _finish_combine(pair: tuple, context_mods: NPCTypeModifiers) -> NPCTypeModifiers:
+    """Fold the context half onto a role+archetype partial"""
+    (recept, bond, patience, time_pressure, domain, drain,
+     carries, silence, critical, enthusiastic, tolerance, exits) = pair
+    return NPCTypeModifiers(
+        # Receptiveness: average of all three
+        base_receptiveness=(recept + context_mods.base_receptiveness) / 3.0,
+        # Bond: use highest
+        base_bond=max(bond, context_mods.base_bond),
+        # Patience: multiply all
+        conversation_patience=patience * context_mods.conversation_patience,
+        # Time pressure: any TRUE makes it TRUE
+        time_pressure=time_pressure or context_mods.time_pressure,
+        # Domain boost: sum all
+        domain_boost=domain + context_mods.domain_boost,
+        # Battery multiplier: multiply all
+        battery_drain_multiplier=drain * context_mods.battery_drain_multiplier,
+        carries_conversation=carries,
+        comfortable_silence=silence,
+        critical_of_flirting=critical,
+        enthusiastic_about_interests=enthusiastic,
+        # Failure tolerance: sum all modifiers
+        failure_tolerance_modifier=tolerance + context_mods.failure_tolerance_modifier,
+        # Exits gracefully: all must be TRUE
+        exits_gracefully=exits and context_mods.exits_gracefully,
+    )
+
 # ============================================================================
 # TYPE DEFINITIONS
 # ============================================================================
@@ -79,270 +362,62 @@ class NPCTypeSystem:
     @staticmethod
     def get_role_modifiers(role: NPCRole) -> NPCTypeModifiers:
         """Get modifiers for a specific role"""
-        
-        modifiers_map = {
-            NPCRole.SERVICE_WORKER: NPCTypeModifiers(
-                base_receptiveness=1.5,      # Lower - they're working
-                conversation_patience=0.7,    # Less patient
-                time_pressure=True,           # Customers waiting
-                battery_drain_multiplier=1.2, # Slightly more draining
-                failure_tolerance_modifier=-1, # Less tolerant of mistakes
-                exits_gracefully=True
-            ),
-            
-            NPCRole.PROFESSIONAL: NPCTypeModifiers(
-                base_receptiveness=2.0,
-                conversation_patience=1.0,
-                domain_boost=0.2,             # +20% when topics match profession
-                battery_drain_multiplier=1.1,
-                failure_tolerance_modifier=0,
-                exits_gracefully=True
-            ),
-            
-            NPCRole.SOCIAL: NPCTypeModifiers(
-                base_receptiveness=2.5,       # Higher - here to socialize
-                conversation_patience=1.2,    # More patient
-                time_pressure=False,
-                battery_drain_multiplier=1.3, # More draining (high energy)
-                failure_tolerance_modifier=1, # More forgiving
-                exits_gracefully=True
-            ),
-            
-            NPCRole.STRANGER: NPCTypeModifiers(
-                base_receptiveness=1.0,       # Very low - why are you talking to me?
-                conversation_patience=0.6,    # Not patient
-                time_pressure=True,           # Wants to get where they're going
-                battery_drain_multiplier=1.4, # Very draining (awkward)
-                failure_tolerance_modifier=-1,
-                exits_gracefully=False        # Might just walk away
-            ),
-            
-            NPCRole.LEISURE: NPCTypeModifiers(
-                base_receptiveness=2.2,
-                conversation_patience=1.1,
-                time_pressure=False,
-                battery_drain_multiplier=0.9, # Less draining (relaxed vibe)
-                failure_tolerance_modifier=1,
-                exits_gracefully=True
-            ),
-            
-            NPCRole.NEIGHBOR: NPCTypeModifiers(
-                base_receptiveness=2.0,
-                base_bond=0.25,               # Already familiar
-                conversation_patience=1.0,
-                time_pressure=False,
-                battery_drain_multiplier=0.9,
-                failure_tolerance_modifier=1, # More forgiving (see each other again)
-                exits_gracefully=True
-            ),
-            
-            NPCRole.REGULAR: NPCTypeModifiers(
-                base_receptiveness=1.8,
-                base_bond=0.5,                # Recognize each other
-                conversation_patience=0.9,
-                time_pressure=False,
-                battery_drain_multiplier=1.0,
-                failure_tolerance_modifier=0,
-                exits_gracefully=True
-            )
-        }
-        
-        return modifiers_map.get(role, NPCTypeModifiers())
+        return _ROLE_MODS.get(role, _DEFAULT_MODS)
     
     @staticmethod
     def get_archetype_modifiers(archetype: PersonalityArchetype) -> NPCTypeModifiers:
         """Get modifiers for personality archetype"""
-        
-        modifiers_map = {
-            PersonalityArchetype.EXTROVERT: NPCTypeModifiers(
-                base_receptiveness=2.5,
-                conversation_patience=1.3,    # Very patient
-                carries_conversation=True,    # Talks more
-                battery_drain_multiplier=1.4, # Exhausting
-                failure_tolerance_modifier=2, # Very forgiving
-                exits_gracefully=True
-            ),
-            
-            PersonalityArchetype.INTROVERT: NPCTypeModifiers(
-                base_receptiveness=1.8,
-                conversation_patience=1.0,
-                comfortable_silence=True,     # Appreciates brevity
-                battery_drain_multiplier=0.7, # Less draining
-                failure_tolerance_modifier=0,
-                exits_gracefully=True
-            ),
-            
-            PersonalityArchetype.SKEPTIC: NPCTypeModifiers(
-                base_receptiveness=1.3,       # Low initial trust
-                conversation_patience=0.8,
-                critical_of_flirting=True,    # 30% penalty to flirt success
-                battery_drain_multiplier=1.2,
-                failure_tolerance_modifier=-1,
-                exits_gracefully=False        # Might be blunt
-            ),
-            
-            PersonalityArchetype.ENTHUSIAST: NPCTypeModifiers(
-                base_receptiveness=2.3,
-                conversation_patience=1.2,
-                domain_boost=0.3,             # +30% for shared interests
-                enthusiastic_about_interests=True,
-                battery_drain_multiplier=1.3,
-                failure_tolerance_modifier=1,
-                exits_gracefully=True
-            ),
-            
-            PersonalityArchetype.BALANCED: NPCTypeModifiers(
-                base_receptiveness=2.0,
-                conversation_patience=1.0,
-                battery_drain_multiplier=1.0,
-                failure_tolerance_modifier=0,
-                exits_gracefully=True
-            )
-        }
-        
-        return modifiers_map.get(archetype, NPCTypeModifiers())
+        return _ARCH_MODS.get(archetype, _DEFAULT_MODS)
     
     @staticmethod
     def get_context_modifiers(context: SocialContext) -> NPCTypeModifiers:
-        """Get modifiers for social context"""
-        
-        modifiers_map = {
-            SocialContext.TASK_FOCUSED: NPCTypeModifiers(
-                base_receptiveness=1.7,
-                conversation_patience=0.8,
-                time_pressure=True,
-                battery_drain_multiplier=1.1,
-                failure_tolerance_modifier=-1,
-                exits_gracefully=True
-            ),
-            
-            SocialContext.LEISURE: NPCTypeModifiers(
-                base_receptiveness=2.3,
-                conversation_patience=1.2,
-                time_pressure=False,
-                battery_drain_multiplier=0.9,
-                failure_tolerance_modifier=1,
-                exits_gracefully=True
-            ),
-            
-            SocialContext.TRAPPED: NPCTypeModifiers(
-                # Roll determines if bored (receptive) or frustrated (not)
-                base_receptiveness=random.choice([1.5, 2.5]),
-                conversation_patience=random.choice([0.7, 1.1]),
-                time_pressure=False,
-                battery_drain_multiplier=1.0,
-                failure_tolerance_modifier=random.choice([-1, 1]),
-                exits_gracefully=True
-            ),
-            
-            SocialContext.WORKING: NPCTypeModifiers(
-                base_receptiveness=1.5,
-                conversation_patience=0.7,
-                time_pressure=True,
-                battery_drain_multiplier=1.2,
-                failure_tolerance_modifier=-1,
-                exits_gracefully=True
-            ),
-            
-            SocialContext.SOCIALIZING: NPCTypeModifiers(
-                base_receptiveness=2.5,
-                conversation_patience=1.3,
-                time_pressure=False,
-                battery_drain_multiplier=1.2,
-                failure_tolerance_modifier=2,
-                exits_gracefully=True
-            )
-        }
-        
-        return modifiers_map.get(context, NPCTypeModifiers())
+        """Get modifiers for social context.
+
+        Deliberately not memoized: TRAPPED re-rolls its mood on every
+        call, and the non-TRAPPED paths already return shared table
+        entries.
+        """
+        if context is SocialContext.TRAPPED:
+            import random
+            # One roll decides bored vs frustrated as a coherent profile
+            return _TRAPPED_BORED if random.random() < 0.5 else _TRAPPED_FRUSTRATED
+        return _CTX_MODS.get(context, _DEFAULT_MODS)
     
     @staticmethod
     def combine_modifiers(role_mods: NPCTypeModifiers,
                          archetype_mods: NPCTypeModifiers,
                          context_mods: NPCTypeModifiers) -> NPCTypeModifiers:
         """Combine multiple modifier sets intelligently"""
-        
-        combined = NPCTypeModifiers()
-        
-        # Receptiveness: average of all three
-        combined.base_receptiveness = (
-            role_mods.base_receptiveness +
-            archetype_mods.base_receptiveness +
-            context_mods.base_receptiveness
-        ) / 3.0
-        
-        # Bond: use highest
-        combined.base_bond = max(
-            role_mods.base_bond,
-            archetype_mods.base_bond,
-            context_mods.base_bond
-        )
-        
-        # Patience: multiply all
-        combined.conversation_patience = (
-            role_mods.conversation_patience *
-            archetype_mods.conversation_patience *
-            context_mods.conversation_patience
-        )
-        
-        # Time pressure: any TRUE makes it TRUE
-        combined.time_pressure = (
-            role_mods.time_pressure or
-            archetype_mods.time_pressure or
-            context_mods.time_pressure
-        )
-        
-        # Domain boost: sum all
-        combined.domain_boost = (
-            role_mods.domain_boost +
-            archetype_mods.domain_boost +
-            context_mods.domain_boost
-        )
-        
-        # Battery multiplier: multiply all
-        combined.battery_drain_multiplier = (
-            role_mods.battery_drain_multiplier *
-            archetype_mods.battery_drain_multiplier *
-            context_mods.battery_drain_multiplier
-        )
-        
-        # Special traits: any TRUE makes it TRUE
-        combined.carries_conversation = (
-            role_mods.carries_conversation or
-            archetype_mods.carries_conversation
-        )
-        
-        combined.comfortable_silence = (
-            role_mods.comfortable_silence or
-            archetype_mods.comfortable_silence
-        )
-        
-        combined.critical_of_flirting = (
-            role_mods.critical_of_flirting or
-            archetype_mods.critical_of_flirting
-        )
-        
-        combined.enthusiastic_about_interests = (
-            role_mods.enthusiastic_about_interests or
-            archetype_mods.enthusiastic_about_interests
-        )
-        
-        # Failure tolerance: sum all modifiers
-        combined.failure_tolerance_modifier = (
-            role_mods.failure_tolerance_modifier +
-            archetype_mods.failure_tolerance_modifier +
-            context_mods.failure_tolerance_modifier
-        )
-        
-        # Exits gracefully: all must be TRUE
-        combined.exits_gracefully = (
-            role_mods.exits_gracefully and
-            archetype_mods.exits_gracefully and
-            context_mods.exits_gracefully
-        )
-        
-        return combined
-    
+        return _finish_combine(_combine_pair(role_mods, archetype_mods),
+                               context_mods)
+
+    @staticmethod
+    def get_combined(role: NPCRole, archetype: PersonalityArchetype,
+                     context: SocialContext) -> NPCTypeModifiers:
+        """Precombined modifiers for a (role, archetype, context) triple.
+
+        Returns shared frozen instances from the import-time table; one
+        dict probe per NPC spawn, no defensive copies needed.
+        """
+        if context is SocialContext.TRAPPED:
+            import random
+            bored, frustrated = _COMBINED_TRAPPED[role, archetype]
+            return bored if random.random() < 0.5 else frustrated
+        return _COMBINED[role, archetype, context]
+
+    @staticmethod
+    def get_combined_batch(triples: List[Tuple[NPCRole, PersonalityArchetype,
+                                               SocialContext]]) -> List[NPCTypeModifiers]:
+        """Combined modifiers for a batch of triples, e.g. populating a venue.
+
+        One pass with the table bound to a local: non-TRAPPED triples
+        cost a dict probe each, TRAPPED ones fall through to the
+        per-call mood flip.
+        """
+        table = _COMBINED
+        get_combined = NPCTypeSystem.get_combined
+        return [table.get(triple) or get_combined(*triple) for triple in triples]
+
     @staticmethod
     def apply_modifiers_to_npc(npc_state, modifiers: NPCTypeModifiers):
         """Apply modifiers to an NPC state object"""
@@ -376,47 +451,126 @@ class NPCTypeSystem:
     @staticmethod
     def get_time_pressure_dialogue(role: NPCRole, context: SocialContext) -> Optional[str]:
         """Generate time pressure flavor text"""
-        
-        if not (NPCTypeSystem.get_role_modifiers(role).time_pressure or
-                NPCTypeSystem.get_context_modifiers(context).time_pressure):
-            return None
-        
-        time_pressure_lines = {
-            NPCRole.SERVICE_WORKER: [
-                "glances at the line forming behind you",
-                "looks toward the other customers waiting",
-                "checks the order screen briefly"
-            ],
-            NPCRole.STRANGER: [
-                "checks their phone",
-                "glances down the street",
-                "shifts their weight, ready to move"
-            ],
-            SocialContext.TASK_FOCUSED: [
-                "glances at their shopping list",
-                "checks their watch",
-                "looks toward their destination"
-            ],
-            SocialContext.WORKING: [
-                "glances at their workstation",
-                "checks the time",
-                "looks around at other tasks"
-            ]
-        }
-        
-        # Get applicable lines
-        applicable = []
-        if role in time_pressure_lines:
-            applicable.extend(time_pressure_lines[role])
-        if context in time_pressure_lines:
-            applicable.extend(time_pressure_lines[context])
-        
-        return random.choice(applicable) if applicable else "seems a bit busy"
+        entry = _TIME_PRESSURE_LINES.get((role, context))
+        if entry:
+            import random
+            lines, count = entry
+            return lines[random.randrange(count)]
+        return None
+
+# ============================================================================
+# PRECOMBINED MODIFIER TABLE
+# ============================================================================
+# The full role x archetype x context product is tiny, so every
+# combination is merged once at import and get_combined is a dict probe -
+# per-NPC spawn does no modifier arithmetic at all, however many NPCs a
+# tick creates.
+# TRAPPED combos keep both mood profiles; get_combined flips between them.
+# Equal results are interned through a pool (frozen dataclasses hash by
+# value), so combinations that merge to the same profile share one object
+# rather than duplicating it per table slot.
+
+_COMBINED: Dict[tuple, NPCTypeModifiers] = {}
+_COMBINED_TRAPPED: Dict[tuple, tuple] = {}
+
+# The pool stays alive after the build loop: _interned closes over it,
+# and later table extensions intern through the same pool
+_pool: Dict[NPCTypeModifiers, NPCTypeModifiers] = {}
+
+def _interned(mods: NPCTypeModifiers) -> NPCTypeModifiers:
+    return _pool.setdefault(mods, mods)
+
+for _role in NPCRole:
+    _role_mods = NPCTypeSystem.get_role_modifiers(_role)
+    for _arch in PersonalityArchetype:
+        # The role+archetype half is identical across contexts: fold it once
+        _pair = _combine_pair(_role_mods, NPCTypeSystem.get_archetype_modifiers(_arch))
+        for _ctx in SocialContext:
+            if _ctx is SocialContext.TRAPPED:
+                _COMBINED_TRAPPED[_role, _arch] = (
+                    _interned(_finish_combine(_pair, _TRAPPED_BORED)),
+                    _interned(_finish_combine(_pair, _TRAPPED_FRUSTRATED)))
+            else:
+                _COMBINED[_role, _arch, _ctx] = _interned(_finish_combine(
+                    _pair, NPCTypeSystem.get_context_modifiers(_ctx)))
+
+del _role, _role_mods, _arch, _pair, _ctx
 
 # ============================================================================
 # GENERATION HELPERS
 # ============================================================================
 
+# Prompt description snippets per type dimension, built once instead of
+# as throwaway literals inside generate_prompt_additions
+_ROLE_DESC = {
+    NPCRole.SERVICE_WORKER: "They're working (barista/cashier/bartender) and somewhat busy with their job.",
+    NPCRole.PROFESSIONAL: "They're in a professional context (coworker/client/networking). Professional demeanor.",
+    NPCRole.SOCIAL: "They're at a social venue (bar/party/event) and open to meeting people.",
+    NPCRole.STRANGER: "They're a random stranger you're approaching. Slightly guarded.",
+    NPCRole.LEISURE: "They're relaxing (coffee shop/park) with time to chat.",
+    NPCRole.NEIGHBOR: "They're your neighbor. You've seen each other around but never really talked.",
+    NPCRole.REGULAR: "You see this person regularly (same gym/coffee shop) but have never spoken."
+}
+
+_ARCH_DESC = {
+    PersonalityArchetype.EXTROVERT: "Personality: Outgoing, talkative, high energy. Enjoys conversation.",
+    PersonalityArchetype.INTROVERT: "Personality: Quiet, thoughtful, values brevity. More reserved.",
+    PersonalityArchetype.SKEPTIC: "Personality: Somewhat skeptical, takes time to warm up. Not easily impressed.",
+    PersonalityArchetype.ENTHUSIAST: "Personality: Gets excited about their interests. Passionate and animated.",
+    PersonalityArchetype.BALANCED: "Personality: Balanced temperament. Neither extremely outgoing nor reserved."
+}
+
+_CTX_DESC = {
+    SocialContext.TASK_FOCUSED: "They're here to accomplish something specific and somewhat focused on that.",
+    SocialContext.LEISURE: "They're here to relax and have time for conversation.",
+    SocialContext.TRAPPED: "They're waiting (line/bus/appointment) and might be bored or frustrated.",
+    SocialContext.WORKING: "They're at work and have job responsibilities to balance.",
+    SocialContext.SOCIALIZING: "They're explicitly here to socialize and meet people."
+}
+
+# Compiled keyword patterns for location-based suggestion, built once
+# at import. Each priority group is a single alternation, so a
+# suggestion is at most one regex scan per group instead of a substring
+# search per keyword. Substring semantics are kept deliberately (no
+# word boundaries): matches inside longer words count ("barstool" ->
+# bar), "coffee shop" is one key, and group order - not token order in
+# the location - breaks ties. Role values are candidate tuples;
+# multi-candidate entries are drawn at random.
+_LOCATION_ROLE_PATTERNS = (
+    (re.compile('coffee shop|café|cafe|counter'),
+     (NPCRole.SERVICE_WORKER, NPCRole.LEISURE)),
+    (re.compile('bar|club|party|event'), (NPCRole.SOCIAL,)),
+    (re.compile('office|work|meeting|conference'), (NPCRole.PROFESSIONAL,)),
+    (re.compile('street|sidewalk|bus|train|transit'), (NPCRole.STRANGER,)),
+    (re.compile('park|library|bookstore'), (NPCRole.LEISURE,)),
+    (re.compile('building|apartment|hallway|mailroom'), (NPCRole.NEIGHBOR,)),
+    (re.compile('gym|studio|regular'), (NPCRole.REGULAR,)),
+)
+_DEFAULT_ROLE_CANDIDATES = (NPCRole.LEISURE, NPCRole.STRANGER)
+
+# Fixed archetype spawn distribution as a cumulative table: one uniform
+# draw plus a bisect replaces random.choices rebuilding its cumulative
+# weights per call
+_ARCHETYPE_CHOICES = (
+    PersonalityArchetype.BALANCED,    # 40% - most common
+    PersonalityArchetype.INTROVERT,   # 20%
+    PersonalityArchetype.EXTROVERT,   # 20%
+    PersonalityArchetype.ENTHUSIAST,  # 10%
+    PersonalityArchetype.SKEPTIC,     # 10%
+)
+_ARCHETYPE_CDF = (0.4, 0.6, 0.8, 0.9, 1.0)
+
+_LOCATION_CONTEXT_PATTERNS = (
+    (re.compile('work|office|counter|register'), SocialContext.WORKING),
+    (re.compile('line|queue|waiting|bus|dmv'), SocialContext.TRAPPED),
+    (re.compile('party|bar|club|event|mixer'), SocialContext.SOCIALIZING),
+    (re.compile('shopping|store|buying|errand'), SocialContext.TASK_FOCUSED),
+)
+
+# Joined prompt additions per (role, archetype, context), filled on
+# first use; repeat triples return the same interned string
+_PROMPT_ADDITIONS_CACHE: Dict[tuple, str] = {}
+
 class NPCTypeGenerator:
     """Helper for generating typed NPCs"""
     
@@ -425,176 +579,121 @@ class NPCTypeGenerator:
                                   archetype: PersonalityArchetype,
                                   context: SocialContext) -> str:
         """Generate additional context for Claude's NPC generation"""
-        
-        role_descriptions = {
-            NPCRole.SERVICE_WORKER: "They're working (barista/cashier/bartender) and somewhat busy with their job.",
-            NPCRole.PROFESSIONAL: "They're in a professional context (coworker/client/networking). Professional demeanor.",
-            NPCRole.SOCIAL: "They're at a social venue (bar/party/event) and open to meeting people.",
-            NPCRole.STRANGER: "They're a random stranger you're approaching. Slightly guarded.",
-            NPCRole.LEISURE: "They're relaxing (coffee shop/park) with time to chat.",
-            NPCRole.NEIGHBOR: "They're your neighbor. You've seen each other around but never really talked.",
-            NPCRole.REGULAR: "You see this person regularly (same gym/coffee shop) but have never spoken."
-        }
-        
-        archetype_descriptions = {
-            PersonalityArchetype.EXTROVERT: "Personality: Outgoing, talkative, high energy. Enjoys conversation.",
-            PersonalityArchetype.INTROVERT: "Personality: Quiet, thoughtful, values brevity. More reserved.",
-            PersonalityArchetype.SKEPTIC: "Personality: Somewhat skeptical, takes time to warm up. Not easily impressed.",
-            PersonalityArchetype.ENTHUSIAST: "Personality: Gets excited about their interests. Passionate and animated.",
-            PersonalityArchetype.BALANCED: "Personality: Balanced temperament. Neither extremely outgoing nor reserved."
-        }
-        
-        context_descriptions = {
-            SocialContext.TASK_FOCUSED: "They're here to accomplish something specific and somewhat focused on that.",
-            SocialContext.LEISURE: "They're here to relax and have time for conversation.",
-            SocialContext.TRAPPED: "They're waiting (line/bus/appointment) and might be bored or frustrated.",
-            SocialContext.WORKING: "They're at work and have job responsibilities to balance.",
-            SocialContext.SOCIALIZING: "They're explicitly here to socialize and meet people."
-        }
-        
-        additions = []
-        additions.append(role_descriptions.get(role, ""))
-        additions.append(archetype_descriptions.get(archetype, ""))
-        additions.append(context_descriptions.get(context, ""))
-        
-        return " ".join(filter(None, additions))
+        key = (role, archetype, context)
+        cached = _PROMPT_ADDITIONS_CACHE.get(key)
+        if cached is None:
+            cached = _PROMPT_ADDITIONS_CACHE[key] = " ".join(
+                part for part in (_ROLE_DESC.get(role, ""),
+                                  _ARCH_DESC.get(archetype, ""),
+                                  _CTX_DESC.get(context, ""))
+                if part)
+        return cached
     
     @staticmethod
     def suggest_role_from_location(location: str) -> NPCRole:
         """Suggest appropriate role based on location"""
-        
-        location_lower = location.lower()
-        
-        if any(word in location_lower for word in ['coffee shop', 'café', 'cafe', 'counter']):
-            return random.choice([NPCRole.SERVICE_WORKER, NPCRole.LEISURE])
-        
-        if any(word in location_lower for word in ['bar', 'club', 'party', 'event']):
-            return NPCRole.SOCIAL
-        
-        if any(word in location_lower for word in ['office', 'work', 'meeting', 'conference']):
-            return NPCRole.PROFESSIONAL
-        
-        if any(word in location_lower for word in ['street', 'sidewalk', 'bus', 'train', 'transit']):
-            return NPCRole.STRANGER
-        
-        if any(word in location_lower for word in ['park', 'library', 'bookstore']):
-            return NPCRole.LEISURE
-        
-        if any(word in location_lower for word in ['building', 'apartment', 'hallway', 'mailroom']):
-            return NPCRole.NEIGHBOR
-        
-        if any(word in location_lower for word in ['gym', 'studio', 'regular']):
-            return NPCRole.REGULAR
-        
-        # Default
-        return random.choice([NPCRole.LEISURE, NPCRole.STRANGER])
+        return NPCTypeGenerator._role_from_lower(location.lower())
+
+    @staticmethod
+    def _role_from_lower(location_lower: str) -> NPCRole:
+        """Role suggestion over an already-lowercased location"""
+        for pattern, candidates in _LOCATION_ROLE_PATTERNS:
+            if pattern.search(location_lower):
+                break
+        else:
+            candidates = _DEFAULT_ROLE_CANDIDATES
+        if len(candidates) == 1:
+            return candidates[0]
+        # Candidate tuples are pairs; one random bit picks between them
+        import random
+        return candidates[random.getrandbits(1)]
     
     @staticmethod
     def random_archetype() -> PersonalityArchetype:
         """Generate random personality archetype with weighted distribution"""
-        
-        weights = {
-            PersonalityArchetype.BALANCED: 0.4,      # 40% - most common
-            PersonalityArchetype.INTROVERT: 0.2,     # 20%
-            PersonalityArchetype.EXTROVERT: 0.2,     # 20%
-            PersonalityArchetype.ENTHUSIAST: 0.1,    # 10%
-            PersonalityArchetype.SKEPTIC: 0.1        # 10%
-        }
-        
-        archetypes = list(weights.keys())
-        probabilities = list(weights.values())
-        
-        return random.choices(archetypes, weights=probabilities)[0]
+        import random
+        return _ARCHETYPE_CHOICES[bisect(_ARCHETYPE_CDF, random.random())]
     
     @staticmethod
     def suggest_context_from_location(location: str) -> SocialContext:
         """Suggest appropriate social context from location"""
-        
-        location_lower = location.lower()
-        
-        if any(word in location_lower for word in ['work', 'office', 'counter', 'register']):
-            return SocialContext.WORKING
-        
-        if any(word in location_lower for word in ['line', 'queue', 'waiting', 'bus', 'dmv']):
-            return SocialContext.TRAPPED
-        
-        if any(word in location_lower for word in ['party', 'bar', 'club', 'event', 'mixer']):
-            return SocialContext.SOCIALIZING
-        
-        if any(word in location_lower for word in ['shopping', 'store', 'buying', 'errand']):
-            return SocialContext.TASK_FOCUSED
-        
+        return NPCTypeGenerator._context_from_lower(location.lower())
+
+    @staticmethod
+    def _context_from_lower(location_lower: str) -> SocialContext:
+        """Context suggestion over an already-lowercased location"""
+        for pattern, context in _LOCATION_CONTEXT_PATTERNS:
+            if pattern.search(location_lower):
+                return context
         # Default leisure
         return SocialContext.LEISURE
 
+    @staticmethod
+    def suggest_role_and_context(location: str) -> Tuple[NPCRole, SocialContext]:
+        """Suggest role and social context, lowercasing the location once.
+
+        Callers that need both (untyped NPC generation, demo listings)
+        should use this instead of the two single suggestions back to
+        back, which would lowercase and scan the same string twice.
+        """
+        location_lower = location.lower()
+        return (NPCTypeGenerator._role_from_lower(location_lower),
+                NPCTypeGenerator._context_from_lower(location_lower))
+
 # ============================================================================
 # USAGE EXAMPLES
 # ============================================================================
 
-def example_usage():
+def example_usage() -> None:
     """Demonstrate NPC type system usage"""
-    
+    import sys
+
+    # Each example is formatted in memory and emitted with one write
+    # instead of a print call per line
+
     # Example 1: Coffee shop barista
-    print("=== Example 1: Coffee Shop Barista ===")
     role = NPCRole.SERVICE_WORKER
     archetype = PersonalityArchetype.INTROVERT
     context = SocialContext.WORKING
-    
-    role_mods = NPCTypeSystem.get_role_modifiers(role)
-    arch_mods = NPCTypeSystem.get_archetype_modifiers(archetype)
-    ctx_mods = NPCTypeSystem.get_context_modifiers(context)
-    
-    combined = NPCTypeSystem.combine_modifiers(role_mods, arch_mods, ctx_mods)
-    
-    print(f"Role: {role.value}")
-    print(f"Archetype: {archetype.value}")
-    print(f"Context: {context.value}")
-    print(f"Starting Receptiveness: {combined.base_receptiveness:.2f}")
-    print(f"Battery Drain Multiplier: {combined.battery_drain_multiplier:.2f}x")
-    print(f"Time Pressure: {combined.time_pressure}")
-    print(f"Comfortable Silence: {combined.comfortable_silence}")
-    print()
-    
+    combined = NPCTypeSystem.get_combined(role, archetype, context)
+    sys.stdout.write(
+        f"=== Example 1: Coffee Shop Barista ===\n"
+        f"Role: {role.value}\n"
+        f"Archetype: {archetype.value}\n"
+        f"Context: {context.value}\n"
+        f"Starting Receptiveness: {combined.base_receptiveness:.2f}\n"
+        f"Battery Drain Multiplier: {combined.battery_drain_multiplier:.2f}x\n"
+        f"Time Pressure: {combined.time_pressure}\n"
+        f"Comfortable Silence: {combined.comfortable_silence}\n\n")
+
     # Example 2: Party extrovert
-    print("=== Example 2: Party Extrovert ===")
     role = NPCRole.SOCIAL
     archetype = PersonalityArchetype.EXTROVERT
     context = SocialContext.SOCIALIZING
-    
-    role_mods = NPCTypeSystem.get_role_modifiers(role)
-    arch_mods = NPCTypeSystem.get_archetype_modifiers(archetype)
-    ctx_mods = NPCTypeSystem.get_context_modifiers(context)
-    
-    combined = NPCTypeSystem.combine_modifiers(role_mods, arch_mods, ctx_mods)
-    
-    print(f"Role: {role.value}")
-    print(f"Archetype: {archetype.value}")
-    print(f"Context: {context.value}")
-    print(f"Starting Receptiveness: {combined.base_receptiveness:.2f}")
-    print(f"Battery Drain Multiplier: {combined.battery_drain_multiplier:.2f}x")
-    print(f"Failure Tolerance Modifier: +{combined.failure_tolerance_modifier}")
-    print(f"Carries Conversation: {combined.carries_conversation}")
-    print()
-    
+    combined = NPCTypeSystem.get_combined(role, archetype, context)
+    sys.stdout.write(
+        f"=== Example 2: Party Extrovert ===\n"
+        f"Role: {role.value}\n"
+        f"Archetype: {archetype.value}\n"
+        f"Context: {context.value}\n"
+        f"Starting Receptiveness: {combined.base_receptiveness:.2f}\n"
+        f"Battery Drain Multiplier: {combined.battery_drain_multiplier:.2f}x\n"
+        f"Failure Tolerance Modifier: +{combined.failure_tolerance_modifier}\n"
+        f"Carries Conversation: {combined.carries_conversation}\n\n")
+
     # Example 3: Neighbor you've never talked to
-    print("=== Example 3: Neighbor ===")
     role = NPCRole.NEIGHBOR
     archetype = PersonalityArchetype.BALANCED
     context = SocialContext.LEISURE
-    
-    role_mods = NPCTypeSystem.get_role_modifiers(role)
-    arch_mods = NPCTypeSystem.get_archetype_modifiers(archetype)
-    ctx_mods = NPCTypeSystem.get_context_modifiers(context)
-    
-    combined = NPCTypeSystem.combine_modifiers(role_mods, arch_mods, ctx_mods)
-    
-    print(f"Role: {role.value}")
-    print(f"Archetype: {archetype.value}")
-    print(f"Context: {context.value}")
-    print(f"Starting Bond: {combined.base_bond:.2f}")
-    print(f"Starting Receptiveness: {combined.base_receptiveness:.2f}")
-    print(f"Battery Drain Multiplier: {combined.battery_drain_multiplier:.2f}x")
-    print()
+    combined = NPCTypeSystem.get_combined(role, archetype, context)
+    sys.stdout.write(
+        f"=== Example 3: Neighbor ===\n"
+        f"Role: {role.value}\n"
+        f"Archetype: {archetype.value}\n"
+        f"Context: {context.value}\n"
+        f"Starting Bond: {combined.base_bond:.2f}\n"
+        f"Starting Receptiveness: {combined.base_receptiveness:.2f}\n"
+        f"Battery Drain Multiplier: {combined.battery_drain_multiplier:.2f}x\n\n")
 
 if __name__ == "__main__":
     example_usage()
\ No newline at end of file